@@ -8,8 +8,15 @@ class CooperadoraConfig(AppConfig):
 
     def ready(self):
     # Crear grupos por defecto y asignar permisos después de las migraciones
-        from django.db.models.signals import post_migrate
+        from django.db.models.signals import post_migrate, post_save, post_delete
         post_migrate.connect(create_cooperadora_groups, sender=self)
+        # Mantener coherente el cache de meses cerrados usado por Transaction.save/delete
+        post_save.connect(invalidate_closed_periods, sender='cooperadora.MonthPeriod')
+        post_delete.connect(invalidate_closed_periods, sender='cooperadora.MonthPeriod')
+        # Invalidar totales y fragmentos cacheados del libro ante cualquier escritura
+        for model in ('cooperadora.Transaction', 'cooperadora.MonthPeriod'):
+            post_save.connect(bump_ledger_version, sender=model)
+            post_delete.connect(bump_ledger_version, sender=model)
         # Asegurar que nuestros templatetags se importen al arrancar para que Django
         # registre la librería de tags. Esto evita errores "not a registered tag library"
         # en entornos donde el sistema de plantillas no detectó el módulo de templatetags
@@ -23,6 +30,18 @@ class CooperadoraConfig(AppConfig):
             pass
 
 
+def invalidate_closed_periods(sender, **kwargs):
+    """Invalidar el cache de meses cerrados cuando cambia un MonthPeriod."""
+    from cooperadora.services import ClosedPeriodCache
+    ClosedPeriodCache.invalidate()
+
+
+def bump_ledger_version(sender, **kwargs):
+    """Incrementar la versión de cache del libro (totales y fragmentos de plantilla)."""
+    from core.services import CacheVersion
+    CacheVersion.bump('cooperadora')
+
+
 def create_cooperadora_groups(sender, **kwargs):
     """Crear dos grupos para la app cooperadora:
     - Cooperadora Admin: control total (add/change/delete/view)
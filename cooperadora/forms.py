@@ -45,3 +45,13 @@ class TransactionForm(forms.ModelForm):
         except Exception:
             # Si algo falla, volver al comportamiento por defecto del modelo.
             pass
+
+    def clean(self):
+        """Rechazar fechas que caen en un mes cerrado (mostrar error en vez de fallar al guardar)."""
+        cleaned = super().clean()
+        d = cleaned.get('date')
+        if d:
+            from .services import ClosedPeriodCache
+            if ClosedPeriodCache.is_closed(d.year, d.month):
+                raise forms.ValidationError('El mes está cerrado; no se pueden registrar movimientos en ese periodo.')
+        return cleaned
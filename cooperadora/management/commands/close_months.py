@@ -0,0 +1,41 @@
+"""Cerrar en bloque un rango de meses consecutivos de la cooperadora.
+
+Ejemplo:
+    py manage.py close_months 2024-01 2024-12
+"""
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from cooperadora.services import MonthCloser
+
+
+def parse_month(value):
+    # date() rechaza también los años fuera de 1..9999 que month_bounds no acepta
+    try:
+        year, month = (int(part) for part in value.split('-'))
+        date(year, month, 1)
+    except ValueError:
+        raise CommandError(f'Mes inválido {value!r}: usar AAAA-MM')
+    return year, month
+
+
+class Command(BaseCommand):
+    help = 'Cierra todos los meses entre DESDE y HASTA (AAAA-MM, inclusive) en una sola transacción.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('desde', help='primer mes a cerrar (AAAA-MM)')
+        parser.add_argument('hasta', help='último mes a cerrar (AAAA-MM)')
+
+    def handle(self, *args, **options):
+        start = parse_month(options['desde'])
+        end = parse_month(options['hasta'])
+        try:
+            results = MonthCloser.close_range(start, end)
+        except ValidationError as e:
+            raise CommandError('; '.join(e.messages))
+
+        for r in results:
+            self.stdout.write(f'{r["period"]}: neto {r["net"]}')
+        self.stdout.write(self.style.SUCCESS(f'Cerrados {len(results)} meses.'))
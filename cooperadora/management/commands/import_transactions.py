@@ -0,0 +1,47 @@
+"""Importar transacciones de la cooperadora desde archivos CSV o JSON Lines.
+
+Ejemplos:
+    py manage.py import_transactions extracto_2024.csv
+    py manage.py import_transactions movimientos.jsonl --chunk-size 5000 --dry-run
+"""
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cooperadora.services import TransactionImporter
+
+
+class Command(BaseCommand):
+    help = 'Importa transacciones en bloque (CSV o JSON Lines) validando meses cerrados.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='archivos a importar')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='forzar formato (por defecto según extensión)')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='filas validadas por bloque')
+        parser.add_argument('--batch-size', type=int, default=1000, help='filas por INSERT en bulk_create')
+        parser.add_argument('--dry-run', action='store_true', help='validar sin guardar')
+
+    def handle(self, *args, **options):
+        importer = TransactionImporter(
+            chunk_size=options['chunk_size'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        for path in options['paths']:
+            try:
+                result = importer.run(importer.read_file(path, options['format']))
+            except (OSError, UnicodeDecodeError, csv.Error) as e:
+                raise CommandError(f'No se pudo leer {path}: {e}')
+
+            for line_no, reason in sorted(result['errors']):
+                self.stderr.write(f'{path}:{line_no}: {reason}')
+            if result['rejected'] > len(result['errors']):
+                self.stderr.write(f'... y {result["rejected"] - len(result["errors"])} rechazos más')
+
+            verb = 'Validadas' if options['dry_run'] else 'Importadas'
+            created = result['read'] - result['rejected'] if options['dry_run'] else result['created']
+            self.stdout.write(self.style.SUCCESS(
+                f'{path}: {verb} {created} de {result["read"]} filas '
+                f'({result["rejected"]} rechazadas) en {result["elapsed"]:.2f}s '
+                f'— {result["rows_per_sec"]:.0f} filas/s'
+            ))
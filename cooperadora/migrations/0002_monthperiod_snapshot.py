@@ -0,0 +1,78 @@
+# Generated by Django 4.2.25 on 2026-10-18 13:01
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_snapshots(apps, schema_editor):
+    """Congelar los totales de los periodos que ya estaban cerrados antes de esta migración."""
+    Transaction = apps.get_model('cooperadora', 'Transaction')
+    MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+    previous_net = {}
+    for mp in MonthPeriod.objects.filter(is_closed=True).order_by('year', 'month'):
+        data = Transaction.objects.filter(date__year=mp.year, date__month=mp.month).aggregate(
+            income=Sum('amount', filter=Q(type='IN')),
+            expense=Sum('amount', filter=Q(type='EX')),
+            adj_positive=Sum('amount', filter=Q(type='AJ', amount__gte=0)),
+            adj_negative=Sum('amount', filter=Q(type='AJ', amount__lt=0)),
+            count=Count('pk'),
+        )
+        zero = Decimal('0.00')
+        mp.income = data['income'] or zero
+        mp.expense = data['expense'] or zero
+        mp.adjustments_positive = data['adj_positive'] or zero
+        mp.adjustments_negative = data['adj_negative'] or zero
+        mp.net = mp.income - mp.expense + mp.adjustments_positive + mp.adjustments_negative
+        mp.row_count = data['count']
+        py, pm = (mp.year - 1, 12) if mp.month == 1 else (mp.year, mp.month - 1)
+        mp.opening_balance = previous_net.get((py, pm), zero)
+        previous_net[(mp.year, mp.month)] = mp.net
+        mp.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cooperadora', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monthperiod',
+            name='adjustments_negative',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='monthperiod',
+            name='adjustments_positive',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='monthperiod',
+            name='expense',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='monthperiod',
+            name='income',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='monthperiod',
+            name='net',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='monthperiod',
+            name='opening_balance',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='monthperiod',
+            name='row_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_snapshots, migrations.RunPython.noop),
+    ]
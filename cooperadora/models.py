@@ -23,6 +23,12 @@ class Transaction(models.Model):
         permissions = [
             ("manage_adjustments", "Can add/change adjustments"),
         ]
+        indexes = [
+            # reportes por rango de fechas y totales por tipo
+            models.Index(fields=['date', 'type'], name='coop_tx_date_type_idx'),
+            # paginación por cursor sobre (date, id)
+            models.Index(fields=['date', 'id'], name='coop_tx_date_id_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_type_display()} {self.amount} on {self.date}"
@@ -33,36 +39,48 @@ class Transaction(models.Model):
 
     def save(self, *args, **kwargs):
     # Evitar modificar transacciones cuando su mes esté cerrado
-        from .models import MonthPeriod  # local import
-        if self.pk:
-            # transacción existente: comprobar si el periodo está cerrado
-            yr, m = self.get_month_period()
-            try:
-                mp = MonthPeriod.objects.filter(year=yr, month=m).first()
-                if mp and mp.is_closed:
+        from .services import ClosedPeriodCache  # local import
+        # Aplica también a altas: un mes cerrado tiene sus totales congelados en
+        # MonthPeriod y una transacción nueva dejaría ese snapshot desactualizado.
+        # El conjunto de meses cerrados está cacheado: sin consulta en el caso común.
+        try:
+            if ClosedPeriodCache.is_closed(*self.get_month_period()):
+                if self.pk:
                     raise ValidationError('El mes está cerrado; no se pueden modificar transacciones en ese periodo.')
-            except ValidationError:
-                raise
-            except Exception:
-                # ignorar errores de consulta
-                pass
+                raise ValidationError('El mes está cerrado; no se pueden agregar transacciones en ese periodo.')
+        except ValidationError:
+            raise
+        except Exception:
+            # ignorar errores de consulta
+            pass
         super().save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
-        from .models import MonthPeriod
-        yr, m = self.get_month_period()
-        mp = MonthPeriod.objects.filter(year=yr, month=m).first()
-        if mp and mp.is_closed:
+        from .services import ClosedPeriodCache
+        if ClosedPeriodCache.is_closed(*self.get_month_period()):
             raise ValidationError('El mes está cerrado; no se pueden eliminar transacciones en ese periodo.')
         return super().delete(*args, **kwargs)
 
 
 class MonthPeriod(models.Model):
-    """Representa un mes/año específico y si está cerrado."""
+    """Representa un mes/año específico y si está cerrado.
+
+    Al cerrar el periodo se guarda una foto (snapshot) de sus totales para que los
+    reportes sumen los meses cerrados sin recorrer sus transacciones. Los campos del
+    snapshot quedan en NULL mientras el periodo está abierto.
+    """
     year = models.PositiveIntegerField()
     month = models.PositiveIntegerField()
     is_closed = models.BooleanField(default=False)
     closed_at = models.DateTimeField(null=True, blank=True)
+    # Snapshot congelado al cierre
+    opening_balance = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    income = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    expense = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    adjustments_positive = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    adjustments_negative = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    net = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True)
+    row_count = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
         unique_together = ('year', 'month')
@@ -74,6 +92,18 @@ class MonthPeriod(models.Model):
     def __str__(self):
         return f"{self.year}-{self.month:02d}"
 
+    @property
+    def has_snapshot(self):
+        """True si el periodo está cerrado y tiene sus totales congelados."""
+        return self.is_closed and self.row_count is not None
+
+    @property
+    def adjustments(self):
+        """Suma con signo de los ajustes del snapshot (None si no hay snapshot)."""
+        if self.adjustments_positive is None or self.adjustments_negative is None:
+            return None
+        return self.adjustments_positive + self.adjustments_negative
+
     def close_month(self, user=None):
         """Cerrar este MonthPeriod.
 
@@ -4,14 +4,70 @@ Este módulo provee:
 - TransactionFactory: creación centralizada de objetos Transaction (patrón factory).
 - CarryoverStrategy: estrategia para crear transacciones de traslado al cerrar un periodo.
 - MonthCloser: orquestador que calcula el neto del periodo y aplica la estrategia de traslado
-    (patrón strategy + clase de servicio).
+    (patrón strategy + clase de servicio). `MonthCloser.close_range` cierra varios meses
+    consecutivos en una sola transacción.
+- LedgerTotals: totales del libro (ingresos, egresos, ajustes y neto) calculados en la base
+    de datos con una única consulta de agregación condicional.
+- RunningBalance: saldo acumulado por fila para una página de transacciones (función de
+    ventana en SQL, partiendo del último mes cerrado).
+- ClosedPeriodCache: conjunto cacheado de meses cerrados para validar altas/ediciones sin
+    consultar MonthPeriod en cada guardado.
+- TransactionImporter: importación masiva (CSV / JSON Lines) validada por bloques e
+    insertada con bulk_create.
 
 Colocar esta lógica en un módulo separado mejora la testeabilidad y mantiene los modelos ligeros.
 """
-from datetime import date
+import csv
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal, InvalidOperation
+from itertools import islice
 from django.utils import timezone
 from django.apps import apps
-from django.db.models import Sum
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Sum, Count, Case, When, F, Q, DecimalField, Window
+from django.db.models.functions import TruncMonth
+from django.utils.dateparse import parse_date
+
+from core.services import CacheVersion
+
+
+def month_bounds(year, month):
+    """Devolver (primer día del mes, primer día del mes siguiente).
+
+    Filtrar con `date__gte=inicio, date__lt=fin` en vez de `date__year`/`date__month`
+    permite usar los índices sobre `date` (extraer año/mes de la columna no lo permite).
+    """
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def next_month(year, month):
+    """Devolver (año, mes) del mes siguiente."""
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def month_sequence(start, end):
+    """Lista de (año, mes) consecutivos desde `start` hasta `end`, inclusive."""
+    months = []
+    current = tuple(start)
+    while current <= tuple(end):
+        months.append(current)
+        current = next_month(*current)
+    return months
+
+
+def previous_closed_net(year, month):
+    """Neto congelado del mes anterior a (año, mes) si está cerrado; 0 si no."""
+    MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+    py, pm = (year - 1, 12) if month == 1 else (year, month - 1)
+    previous = MonthPeriod.objects.filter(year=py, month=pm, is_closed=True).values_list('net', flat=True).first()
+    return previous or Decimal('0.00')
 
 
 class TransactionFactory:
@@ -26,6 +82,12 @@ class TransactionFactory:
         Transaction = apps.get_model('cooperadora', 'Transaction')
         return Transaction.objects.create(date=date_, type=ttype, amount=amount, description=description or '')
 
+    @staticmethod
+    def build(date_, ttype, amount, description=None):
+        """Como `create` pero sin guardar (para insertar en bloque con bulk_create)."""
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        return Transaction(date=date_, type=ttype, amount=amount, description=description or '')
+
 
 class CarryoverStrategy:
     """Estrategia por defecto para el traslado de saldos.
@@ -44,6 +106,20 @@ class CarryoverStrategy:
         Returns:
             instancia de Transaction o None si net == 0
         """
+        fields = self.carryover_fields(year, month, net)
+        if fields is None:
+            return None
+        return TransactionFactory.create(*fields)
+
+    def build_carryover(self, year, month, net):
+        """Igual que `create_carryover` pero devuelve la transacción sin guardar."""
+        fields = self.carryover_fields(year, month, net)
+        if fields is None:
+            return None
+        return TransactionFactory.build(*fields)
+
+    def carryover_fields(self, year, month, net):
+        """Devolver (fecha, tipo, monto, descripción) del traslado, o None si net == 0."""
         if net == 0:
             return None
 
@@ -53,7 +129,6 @@ class CarryoverStrategy:
         else:
             ny, nm = year, month + 1
 
-        TransactionFactory = TransactionFactory  # nombre local por claridad
         if net > 0:
             ttype = apps.get_model('cooperadora', 'Transaction').INCOME
             amt = net
@@ -62,7 +137,7 @@ class CarryoverStrategy:
             amt = -net
 
         carry_date = date(ny, nm, 1)
-        return TransactionFactory.create(carry_date, ttype, amt, description=f"Saldo trasladado desde {year}-{month:02d}")
+        return carry_date, ttype, amt, f"Saldo trasladado desde {year}-{month:02d}"
 
 
 class MonthCloser:
@@ -80,40 +155,640 @@ class MonthCloser:
 
     def compute_net(self):
         """Calcular net = total ingresos - total egresos + total ajustes para el periodo."""
-        Transaction = apps.get_model('cooperadora', 'Transaction')
-        qs = Transaction.objects.filter(date__year=self.month_period.year, date__month=self.month_period.month)
-        income = qs.filter(type=Transaction.INCOME).aggregate(total=Sum('amount'))['total'] or 0
-        expense = qs.filter(type=Transaction.EXPENSE).aggregate(total=Sum('amount'))['total'] or 0
-        adj = qs.filter(type=Transaction.ADJUSTMENT).aggregate(total=Sum('amount'))['total'] or 0
-        return income - expense + adj
+        return LedgerTotals.for_period(self.month_period.year, self.month_period.month)['net']
 
     def close(self):
-        """Realizar el cierre: calcular neto, crear traslado (si corresponde) y marcar como cerrado."""
+        """Realizar el cierre: calcular neto, crear traslado (si corresponde) y marcar como cerrado.
+
+        Además congela en el MonthPeriod un snapshot de los totales del mes
+        (saldo inicial, ingresos, egresos, ajustes, neto y cantidad de filas).
+        """
         if self.month_period.is_closed:
             return None
 
-        net = self.compute_net()
+        with transaction.atomic():
+            totals = LedgerTotals.for_period(self.month_period.year, self.month_period.month)
+            net = totals['net']
 
-    # Asegurar que exista el siguiente periodo (crear si falta)
-        MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
-        if self.month_period.month == 12:
-            ny, nm = self.month_period.year + 1, 1
-        else:
-            ny, nm = self.month_period.year, self.month_period.month + 1
+        # Asegurar que exista el siguiente periodo (crear si falta)
+            MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+            if self.month_period.month == 12:
+                ny, nm = self.month_period.year + 1, 1
+            else:
+                ny, nm = self.month_period.year, self.month_period.month + 1
 
-        MonthPeriod.objects.get_or_create(year=ny, month=nm)
+            next_period, _ = MonthPeriod.objects.get_or_create(year=ny, month=nm)
+            if next_period.is_closed and net != 0:
+                raise ValidationError(f'El mes siguiente ({next_period}) ya está cerrado; no se puede trasladar el saldo.')
 
-    # Crear traslado usando la estrategia
-        carry = None
-        if net != 0:
-            carry = self.strategy.create_carryover(self.month_period.year, self.month_period.month, net)
+        # Crear traslado usando la estrategia
+            carry = None
+            if net != 0:
+                carry = self.strategy.create_carryover(self.month_period.year, self.month_period.month, net)
 
-        # Mark closed
-        self.month_period.is_closed = True
-        self.month_period.closed_at = timezone.now()
-        self.month_period.save()
+            # Snapshot + marcar como cerrado
+            self.apply_snapshot(totals)
+            self.month_period.is_closed = True
+            self.month_period.closed_at = timezone.now()
+            self.month_period.save()
 
         return {
             'net': net,
             'carry': carry,
         }
+
+    def apply_snapshot(self, totals, opening_balance=None):
+        """Copiar `totals` (resultado de LedgerTotals) a los campos de snapshot del periodo.
+
+        El saldo inicial es el neto congelado del mes anterior, que ya ingresó a este
+        mes como transacción de traslado. Si no se pasa `opening_balance` se lee de
+        la base.
+        """
+        if opening_balance is None:
+            opening_balance = previous_closed_net(self.month_period.year, self.month_period.month)
+
+        mp = self.month_period
+        mp.opening_balance = opening_balance
+        mp.income = totals['income']
+        mp.expense = totals['expense']
+        mp.adjustments_positive = totals['adjustments_positive']
+        mp.adjustments_negative = totals['adjustments_negative']
+        mp.net = totals['net']
+        mp.row_count = totals['count']
+
+    @classmethod
+    def close_range(cls, start, end, user=None, carryover_strategy=None):
+        """Cerrar en bloque los meses consecutivos desde `start` hasta `end` (inclusive).
+
+        Todo ocurre en una transacción: los netos de todos los meses salen de una única
+        consulta agrupada por mes, los traslados se encadenan en memoria (el traslado
+        del mes M suma al neto de M+1), y luego se insertan los traslados con
+        bulk_create y se actualizan los MonthPeriod con bulk_update.
+
+        Args:
+            start, end: tuplas (año, mes); end >= start.
+            user: usuario opcional que realiza la acción (reservado para auditoría).
+            carryover_strategy: estrategia con `build_carryover` (por defecto CarryoverStrategy).
+        Returns:
+            lista de dicts {'period', 'net', 'carry'} en orden cronológico.
+        Raises:
+            ValidationError si el rango es inválido, algún mes ya está cerrado o el
+            mes siguiente al rango está cerrado y hay saldo para trasladar.
+        """
+        MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        strategy = carryover_strategy or CarryoverStrategy()
+
+        months = month_sequence(start, end)
+        if not months:
+            raise ValidationError('Rango de meses inválido: el mes final es anterior al inicial.')
+        after = next_month(*end)
+        wanted = months + [after]
+
+        with transaction.atomic():
+            MonthPeriod.objects.bulk_create(
+                [MonthPeriod(year=y, month=m) for y, m in wanted], ignore_conflicts=True,
+            )
+            periods_q = Q()
+            for y, m in wanted:
+                periods_q |= Q(year=y, month=m)
+            periods = {
+                (mp.year, mp.month): mp
+                for mp in MonthPeriod.objects.select_for_update().filter(periods_q)
+            }
+            already = [str(periods[key]) for key in months if periods[key].is_closed]
+            if already:
+                raise ValidationError(f'Meses ya cerrados en el rango: {", ".join(already)}')
+
+            first_day = month_bounds(*months[0])[0]
+            last_day = month_bounds(*months[-1])[1]
+            monthly = LedgerTotals.by_month(first_day, last_day)
+            opening = previous_closed_net(*months[0])
+
+            now = timezone.now()
+            carries = []
+            results = []
+            carry_in = Decimal('0.00')
+            for key in months:
+                raw = monthly.get(key) or LedgerTotals._build(None, None, None, None, 0)
+                # El traslado del mes anterior (aún no insertado) entra como IN/EX del mes
+                income, expense, count = raw['income'], raw['expense'], raw['count']
+                if carry_in > 0:
+                    income, count = income + carry_in, count + 1
+                elif carry_in < 0:
+                    expense, count = expense - carry_in, count + 1
+                totals = LedgerTotals._build(
+                    income, expense, raw['adjustments_positive'], raw['adjustments_negative'], count,
+                )
+                net = totals['net']
+
+                mp = periods[key]
+                closer = cls(mp, user=user, carryover_strategy=strategy)
+                closer.apply_snapshot(totals, opening_balance=opening)
+                mp.is_closed = True
+                mp.closed_at = now
+
+                carry = strategy.build_carryover(key[0], key[1], net) if net != 0 else None
+                if carry is not None:
+                    carries.append(carry)
+                results.append({'period': mp, 'net': net, 'carry': carry})
+                opening = net
+                carry_in = net
+
+            if carry_in != 0 and periods[after].is_closed:
+                raise ValidationError(f'El mes siguiente ({periods[after]}) ya está cerrado; no se puede trasladar el saldo.')
+
+            Transaction.objects.bulk_create(carries)
+            MonthPeriod.objects.bulk_update(
+                [periods[key] for key in months],
+                ['is_closed', 'closed_at', 'opening_balance', 'income', 'expense',
+                 'adjustments_positive', 'adjustments_negative', 'net', 'row_count'],
+            )
+            # bulk_update no dispara señales: invalidar a mano el cache de meses cerrados
+            # y las páginas/totales cacheados del libro
+            ClosedPeriodCache.invalidate()
+            CacheVersion.bump('cooperadora')
+
+        return results
+
+
+class LedgerTotals:
+    """Totales del libro de la cooperadora calculados en la base de datos.
+
+    Todos los totales se obtienen con una sola consulta `aggregate()` usando
+    `Sum` + `Case/When` sobre `type` y el signo de `amount`, de modo que el
+    costo no depende de cuántas filas haya que mostrar en la vista.
+    `compute_range` además suma los meses cerrados desde sus snapshots y solo
+    recorre transacciones de los meses abiertos.
+
+    Convenciones del resultado (dict):
+    - income: suma de ingresos (IN)
+    - expense: suma de egresos (EX), en valor positivo
+    - adjustments: suma de ajustes (AJ) con su signo
+    - adjustments_positive / adjustments_negative: ajustes separados por signo
+    - net: income - expense + adjustments
+    - total_income: ingresos + ajustes positivos (columna "Ingresos" de las vistas)
+    - total_expense: -egresos + ajustes negativos (columna "Egresos", en negativo)
+    - total_general: total_income + total_expense (igual a net)
+    - count: cantidad de transacciones consideradas
+    """
+
+    @staticmethod
+    def _sum_when(condition):
+        return Sum(
+            Case(When(condition, then=F('amount')), output_field=DecimalField(max_digits=14, decimal_places=2))
+        )
+
+    @classmethod
+    def compute(cls, queryset=None):
+        """Calcular los totales para `queryset` (por defecto, todas las transacciones).
+
+        Args:
+            queryset: QuerySet de Transaction ya filtrado (rango de fechas, periodo, etc.)
+        Returns:
+            dict con las llaves descritas en la clase.
+        """
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        if queryset is None:
+            queryset = Transaction.objects.all()
+
+        adjustment = Q(type=Transaction.ADJUSTMENT)
+        # order_by() vacío: el orden no afecta a la agregación y evita que se arrastre al SQL
+        data = queryset.order_by().aggregate(
+            income=cls._sum_when(Q(type=Transaction.INCOME)),
+            expense=cls._sum_when(Q(type=Transaction.EXPENSE)),
+            adj_positive=cls._sum_when(adjustment & Q(amount__gte=0)),
+            adj_negative=cls._sum_when(adjustment & Q(amount__lt=0)),
+            count=Count('pk'),
+        )
+        return cls._build(
+            data['income'], data['expense'], data['adj_positive'], data['adj_negative'], data['count'],
+        )
+
+    @staticmethod
+    def _build(income, expense, adj_positive, adj_negative, count):
+        # Normalizar a dos decimales: algunos motores (SQLite) devuelven la suma sin escala fija
+        cents = Decimal('0.01')
+        income = (income or Decimal('0')).quantize(cents)
+        expense = (expense or Decimal('0')).quantize(cents)
+        adj_positive = (adj_positive or Decimal('0')).quantize(cents)
+        adj_negative = (adj_negative or Decimal('0')).quantize(cents)
+
+        total_income = income + adj_positive
+        total_expense = -expense + adj_negative
+        return {
+            'income': income,
+            'expense': expense,
+            'adjustments': adj_positive + adj_negative,
+            'adjustments_positive': adj_positive,
+            'adjustments_negative': adj_negative,
+            'net': income - expense + adj_positive + adj_negative,
+            'total_income': total_income,
+            'total_expense': total_expense,
+            'total_general': total_income + total_expense,
+            'count': count or 0,
+        }
+
+    @classmethod
+    def for_period(cls, year, month):
+        """Totales de un mes puntual (año, mes)."""
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        start, end = month_bounds(year, month)
+        return cls.compute(Transaction.objects.filter(date__gte=start, date__lt=end))
+
+    @classmethod
+    def by_month(cls, date_from, date_until):
+        """Totales por mes en [date_from, date_until) con una única consulta agrupada.
+
+        Returns:
+            dict {(año, mes): totales} solo con los meses que tienen movimientos.
+        """
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        adjustment = Q(type=Transaction.ADJUSTMENT)
+        rows = (
+            Transaction.objects.filter(date__gte=date_from, date__lt=date_until)
+            .annotate(period=TruncMonth('date'))
+            .order_by()
+            .values('period')
+            .annotate(
+                income=cls._sum_when(Q(type=Transaction.INCOME)),
+                expense=cls._sum_when(Q(type=Transaction.EXPENSE)),
+                adj_positive=cls._sum_when(adjustment & Q(amount__gte=0)),
+                adj_negative=cls._sum_when(adjustment & Q(amount__lt=0)),
+                count=Count('pk'),
+            )
+        )
+        return {
+            (row['period'].year, row['period'].month): cls._build(
+                row['income'], row['expense'], row['adj_positive'], row['adj_negative'], row['count'],
+            )
+            for row in rows
+        }
+
+    @classmethod
+    def cached_range(cls, date_from=None, date_to=None):
+        """`compute_range` guardado en el cache bajo la versión actual del libro.
+
+        Cualquier escritura en Transaction o MonthPeriod incrementa la versión
+        'cooperadora' (señales en `CooperadoraConfig.ready` y las operaciones en
+        bloque de este módulo), así que nunca se devuelven totales viejos.
+        """
+        key = 'cooperadora:totals:%s:%s:%s' % (
+            CacheVersion.get('cooperadora'),
+            date_from.isoformat() if date_from else '',
+            date_to.isoformat() if date_to else '',
+        )
+        totals = cache.get(key)
+        if totals is None:
+            totals = cls.compute_range(date_from, date_to)
+            cache.set(key, totals)
+        return totals
+
+    @classmethod
+    def compute_range(cls, date_from=None, date_to=None):
+        """Totales entre dos fechas (inclusivas, ambas opcionales) usando snapshots.
+
+        Los meses cerrados con snapshot que caen completos dentro del rango se suman
+        desde MonthPeriod (una fila por mes); el resto del rango se agrega desde
+        Transaction excluyendo esos meses. El resultado es el mismo que
+        `compute()` sobre el rango completo.
+        """
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+
+        periods = MonthPeriod.objects.filter(is_closed=True, row_count__isnull=False)
+        if date_from:
+            # primer mes que empieza dentro del rango
+            y, m = date_from.year, date_from.month
+            if date_from.day != 1:
+                y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+            periods = periods.filter(Q(year__gt=y) | Q(year=y, month__gte=m))
+        if date_to:
+            # último mes que termina dentro del rango
+            y, m = date_to.year, date_to.month
+            if (date_to + timedelta(days=1)).day != 1:
+                y, m = (y - 1, 12) if m == 1 else (y, m - 1)
+            periods = periods.filter(Q(year__lt=y) | Q(year=y, month__lte=m))
+
+        snapshots = list(periods.order_by('year', 'month').values_list(
+            'year', 'month', 'income', 'expense', 'adjustments_positive', 'adjustments_negative', 'row_count',
+        ))
+
+        qs = Transaction.objects.all()
+        if date_from:
+            qs = qs.filter(date__gte=date_from)
+        if date_to:
+            qs = qs.filter(date__lte=date_to)
+        for start, end in cls._month_spans([(row[0], row[1]) for row in snapshots]):
+            qs = qs.exclude(date__gte=start, date__lt=end)
+        raw = cls.compute(qs)
+
+        return cls._build(
+            raw['income'] + sum((row[2] for row in snapshots), Decimal('0')),
+            raw['expense'] + sum((row[3] for row in snapshots), Decimal('0')),
+            raw['adjustments_positive'] + sum((row[4] for row in snapshots), Decimal('0')),
+            raw['adjustments_negative'] + sum((row[5] for row in snapshots), Decimal('0')),
+            raw['count'] + sum(row[6] for row in snapshots),
+        )
+
+    @staticmethod
+    def _month_spans(months):
+        """Agrupar meses (año, mes) ordenados en rangos contiguos [inicio, fin)."""
+        spans = []
+        for y, m in months:
+            start, end = month_bounds(y, m)
+            if spans and spans[-1][1] == start:
+                spans[-1][1] = end
+            else:
+                spans.append([start, end])
+        return [tuple(span) for span in spans]
+
+
+class RunningBalance:
+    """Saldo acumulado (después de cada movimiento) para una página de transacciones.
+
+    Al cerrar un mes su neto entra al mes siguiente como transacción de traslado, por
+    lo que el saldo se "reinicia" después de cada mes cerrado: el saldo de una fila es
+    la suma con signo (IN +, EX -, AJ con su signo) de las filas desde el primer día
+    posterior al último mes cerrado. Así el punto de partida es el snapshot del último
+    cierre y nunca se recorren meses cerrados.
+
+    Consultas: una agregación para el saldo previo a la primera fila de la página y una
+    consulta con `Window(Sum(...), order_by=[date, id])` sobre las filas de la página.
+    """
+
+    @staticmethod
+    def signed_amount():
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        return Case(
+            When(type=Transaction.EXPENSE, then=-F('amount')),
+            default=F('amount'),
+            output_field=DecimalField(max_digits=14, decimal_places=2),
+        )
+
+    @classmethod
+    def annotate(cls, transactions):
+        """Asignar `balance` a cada Transaction de `transactions` (una página contigua en
+        orden (date, id), ascendente o descendente). Devuelve la misma lista."""
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        rows = sorted(transactions, key=lambda t: (t.date, t.pk))
+        if not rows:
+            return transactions
+        first = rows[0]
+        closed = ClosedPeriodCache.periods()
+
+        # Saldo justo antes de la primera fila: filas del segmento abierto que la preceden
+        first_month = (first.date.year, first.date.month)
+        last_closed = max((p for p in closed if p < first_month), default=None)
+        before = Transaction.objects.filter(Q(date__lt=first.date) | Q(date=first.date, pk__lt=first.pk))
+        if last_closed is not None:
+            before = before.filter(date__gte=month_bounds(*next_month(*last_closed))[0])
+        opening = before.order_by().aggregate(total=Sum(cls.signed_amount()))['total'] or Decimal('0')
+
+        # Acumulado dentro de la página, reiniciado por mes (el cierre de un mes lo reinicia)
+        running = dict(
+            Transaction.objects.filter(pk__in=[t.pk for t in rows])
+            .annotate(running=Window(
+                Sum(cls.signed_amount()),
+                partition_by=[TruncMonth('date')],
+                order_by=[F('date').asc(), F('id').asc()],
+            ))
+            .values_list('pk', 'running')
+        )
+
+        # Desplazamiento de cada mes: continúa el saldo del mes anterior salvo que
+        # algún mes cerrado se interponga (su neto ya viene como traslado)
+        offset = opening
+        month = first_month
+        last_value = None
+        cents = Decimal('0.01')
+        for t in rows:
+            key = (t.date.year, t.date.month)
+            if key != month:
+                carried = offset + last_value
+                offset = Decimal('0')
+                if not any(p in closed for p in month_sequence(month, key)[:-1]):
+                    offset = carried
+                month = key
+            last_value = running[t.pk]
+            t.balance = (offset + last_value).quantize(cents)
+        return transactions
+
+
+class ClosedPeriodCache:
+    """Cache del conjunto de meses cerrados como tuplas (año, mes).
+
+    `Transaction.save()`/`delete()` consultan este conjunto en lugar de hacer una
+    consulta a MonthPeriod por fila. El conjunto se carga con una sola consulta y
+    se invalida desde las señales post_save/post_delete de MonthPeriod (ver
+    `CooperadoraConfig.ready`).
+
+    Vive en el cache indicado por `COOPERADORA_CLOSED_PERIODS_CACHE` (por defecto
+    'default', el backend de CACHE_BACKEND), así que con un cache compartido un
+    cierre hecho en un worker se ve enseguida en los demás. Como además expira a
+    los `COOPERADORA_CLOSED_PERIODS_TIMEOUT` segundos, ni siquiera con un cache por
+    proceso un worker sigue permitiendo editar un mes cerrado más que ese lapso.
+    """
+
+    cache_key = 'cooperadora:closed_periods'
+
+    @staticmethod
+    def _backend():
+        return caches[getattr(settings, 'COOPERADORA_CLOSED_PERIODS_CACHE', 'default')]
+
+    @staticmethod
+    def _load():
+        MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+        return frozenset(MonthPeriod.objects.filter(is_closed=True).values_list('year', 'month'))
+
+    @classmethod
+    def periods(cls):
+        """Devolver el frozenset de (año, mes) cerrados, cargándolo si hace falta."""
+        backend = cls._backend()
+        value = backend.get(cls.cache_key)
+        if value is None:
+            value = cls._load()
+            backend.set(cls.cache_key, value, getattr(settings, 'COOPERADORA_CLOSED_PERIODS_TIMEOUT', 60))
+        return value
+
+    @classmethod
+    def is_closed(cls, year, month):
+        return (year, month) in cls.periods()
+
+    @classmethod
+    def invalidate(cls):
+        """Descartar el conjunto cacheado.
+
+        Se invalida en el momento y otra vez al confirmar la transacción, para que
+        una lectura concurrente previa al commit no deje cacheado el estado viejo.
+        """
+        cls._clear()
+        transaction.on_commit(cls._clear)
+
+    @classmethod
+    def _clear(cls):
+        cls._backend().delete(cls.cache_key)
+
+
+class TransactionImporter:
+    """Importación masiva de transacciones desde CSV o JSON Lines.
+
+    Las filas se leen en streaming y se procesan por bloques de `chunk_size`:
+    - se validan (fecha, tipo, monto);
+    - se rechazan las que caen en meses cerrados (una consulta por bloque);
+    - se crean en bloque los MonthPeriod que falten;
+    - se insertan con `bulk_create(batch_size=...)`.
+    Todo el archivo se importa dentro de una única transacción de base de datos.
+
+    Columnas aceptadas: `date`, `type` (IN/EX/AJ o su etiqueta), `amount`,
+    `description`; o bien `income`/`expense` como en el CSV exportado por el reporte.
+    """
+
+    max_errors = 100
+
+    def __init__(self, chunk_size=1000, batch_size=1000, dry_run=False):
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+    @staticmethod
+    def read_file(path, fmt=None):
+        """Iterar (número de línea, dict) desde un archivo CSV o JSON Lines."""
+        fmt = fmt or ('jsonl' if str(path).endswith(('.jsonl', '.ndjson', '.json')) else 'csv')
+        with open(path, newline='', encoding='utf-8-sig') as fh:
+            if fmt == 'csv':
+                reader = csv.DictReader(fh)
+                for row in reader:
+                    yield row, reader.line_num
+            else:
+                for line_no, line in enumerate(fh, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line), line_no
+                    except ValueError:
+                        yield None, line_no
+
+    def parse_row(self, raw):
+        """Convertir un dict crudo en kwargs de Transaction o levantar ValueError."""
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        if not isinstance(raw, dict):
+            raise ValueError('fila ilegible')
+        raw_date = str(raw.get('date') or '').strip()
+        try:
+            date_ = parse_date(raw_date)
+        except ValueError:
+            date_ = None
+        if date_ is None:
+            raise ValueError(f'fecha inválida: {raw_date!r}')
+
+        ttype = str(raw.get('type') or '').strip()
+        codes = {code.lower(): code for code, _label in Transaction.TYPE_CHOICES}
+        codes.update({label.lower(): code for code, label in Transaction.TYPE_CHOICES})
+
+        try:
+            ttype = codes[ttype.lower()]
+        except KeyError:
+            raise ValueError(f'tipo inválido: {ttype!r}')
+
+        if raw.get('amount') in (None, '') and ('income' in raw or 'expense' in raw):
+            # formato del CSV exportado: los egresos (EX) figuran negados en la columna expense
+            if raw.get('income') not in (None, ''):
+                amount = parse_amount(raw.get('income'))
+            else:
+                amount = parse_amount(raw.get('expense'))
+                if ttype == Transaction.EXPENSE:
+                    amount = -amount
+        else:
+            amount = parse_amount(raw.get('amount'))
+        return {
+            'date': date_,
+            'type': ttype,
+            'amount': amount,
+            'description': str(raw.get('description') or ''),
+        }
+
+    def run(self, rows):
+        """Importar `rows` (iterable de (dict, número de línea)).
+
+        Returns:
+            dict con 'read', 'created', 'rejected', 'errors' (lista de (línea, motivo),
+            truncada a `max_errors`), 'elapsed' (segundos) y 'rows_per_sec'.
+        """
+        started = time.perf_counter()
+        result = {'read': 0, 'created': 0, 'rejected': 0, 'errors': []}
+        rows = iter(rows)
+        with transaction.atomic():
+            while True:
+                chunk = list(islice(rows, self.chunk_size))
+                if not chunk:
+                    break
+                self._import_chunk(chunk, result)
+            if self.dry_run:
+                transaction.set_rollback(True)
+        elapsed = time.perf_counter() - started
+        result['elapsed'] = elapsed
+        result['rows_per_sec'] = result['read'] / elapsed if elapsed else 0.0
+        if not self.dry_run and result['created']:
+            ClosedPeriodCache.invalidate()
+            CacheVersion.bump('cooperadora')
+        return result
+
+    def _reject(self, result, line_no, reason):
+        result['rejected'] += 1
+        if len(result['errors']) < self.max_errors:
+            result['errors'].append((line_no, reason))
+
+    def _import_chunk(self, chunk, result):
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+
+        valid = []
+        for raw, line_no in chunk:
+            result['read'] += 1
+            try:
+                valid.append((line_no, self.parse_row(raw)))
+            except ValueError as e:
+                self._reject(result, line_no, str(e))
+        if not valid:
+            return
+
+        months = {(data['date'].year, data['date'].month) for _line, data in valid}
+        months_q = Q()
+        for y, m in months:
+            months_q |= Q(year=y, month=m)
+        closed = set(MonthPeriod.objects.filter(months_q, is_closed=True).values_list('year', 'month'))
+
+        objs = []
+        for line_no, data in valid:
+            if (data['date'].year, data['date'].month) in closed:
+                self._reject(result, line_no, f'mes cerrado: {data["date"]:%Y-%m}')
+                continue
+            objs.append(Transaction(**data))
+
+        MonthPeriod.objects.bulk_create(
+            [MonthPeriod(year=y, month=m) for y, m in sorted(months - closed)],
+            ignore_conflicts=True,
+        )
+        Transaction.objects.bulk_create(objs, batch_size=self.batch_size)
+        result['created'] += len(objs)
+
+
+def parse_amount(value):
+    """Convertir '1234.50', '1.234,50' o '1234,5' a Decimal con dos decimales."""
+    text = str(value if value is not None else '').strip().replace('$', '').replace(' ', '')
+    if ',' in text:
+        # estilo es-AR: punto de miles y coma decimal
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        amount = Decimal(text).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f'monto inválido: {value!r}')
+    if not amount.is_finite():
+        # 'nan' pasa quantize y después falla al comparar
+        raise ValueError(f'monto inválido: {value!r}')
+    if abs(amount) >= Decimal('1e10'):
+        # Transaction.amount: max_digits=12, decimal_places=2
+        raise ValueError(f'monto fuera de rango: {value!r}')
+    return amount
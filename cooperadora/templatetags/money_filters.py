@@ -1,7 +1,64 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+
 from django import template
 
 register = template.Library()
 
+# Mapear código de moneda a símbolo (se calcula una vez, no en cada llamada)
+SYMBOLS = {
+    'ARS': '$',
+    'USD': 'US$',
+}
+
+_CENTS = Decimal('0.01')
+# Estilo es-AR: intercambiar separadores de miles y decimales en una sola pasada
+_SWAP_SEPARATORS = str.maketrans(',.', '.,')
+
+
+def _to_decimal(value):
+    """Convertir a Decimal sin pasar por float (None si no es numérico o no es finito)."""
+    if isinstance(value, Decimal):
+        dec = value
+    elif isinstance(value, int):
+        dec = Decimal(value)
+    elif isinstance(value, (float, str)):
+        try:
+            # str() de un float da su representación más corta (0.1 -> '0.1')
+            dec = Decimal(str(value).strip())
+        except (InvalidOperation, ValueError):
+            return None
+    else:
+        try:
+            dec = Decimal(str(float(value)))
+        except (TypeError, ValueError, InvalidOperation):
+            return None
+    return dec if dec.is_finite() else None
+
+
+def _format(value, currency):
+    dec = _to_decimal(value)
+    if dec is None:
+        return value
+    symbol = SYMBOLS.get(currency.upper(), currency)
+    # Redondear a centavos en Decimal (exacto, sin errores de float)
+    try:
+        dec = dec.quantize(_CENTS, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        # más dígitos que la precisión del contexto (p. ej. 1e400): dejar el valor como está
+        return value
+    if not dec:
+        # -0.001 redondea a -0.00: mostrarlo como cero, sin signo
+        dec = Decimal('0.00')
+    if dec < 0:
+        return f"-{symbol}" + f"{-dec:,.2f}".translate(_SWAP_SEPARATORS)
+    return symbol + f"{dec:,.2f}".translate(_SWAP_SEPARATORS)
+
+
+# Las tablas repiten muchos importes (cuotas, montos redondos): cachear el texto.
+# ~32k entradas ocupan unos pocos MB por worker.
+_format_cached = lru_cache(maxsize=32768)(_format)
+
 
 @register.filter()
 def money(value, currency='ARS'):
@@ -14,36 +71,17 @@ def money(value, currency='ARS'):
     Comportamiento:
     - Mapea el código de moneda a un símbolo (ARS -> '$', USD -> 'US$').
     - Separador de miles es '.' y separador decimal es ',' (estilo es-AR).
-    - Siempre muestra dos decimales.
+    - Siempre muestra dos decimales, redondeando en Decimal (sin pasar por float).
+    - Los resultados se cachean (LRU) porque las tablas repiten muchos importes.
 
-    Ejemplo: 1234.5 -> "ARS -> $ 1.234,50"
-    Valores negativos preservan el signo menos: -200 -> "- $ 200,00"
+    Ejemplos:
+        1234.5 -> "$1.234,50"; Decimal('0.005') -> "$0,01" (ROUND_HALF_UP)
+        -200 -> "-$200,00"; -0.001 -> "$0,00" (el cero no lleva signo)
+        1234.5|money:"USD" -> "US$1.234,50"
     """
     try:
-        # Convertir a float/Decimal-compatible
-        val = float(value)
-    except Exception:
-        return value
-
-    # Mapear código de moneda a símbolo
-    symbols = {
-        'ARS': '$',
-        'USD': 'US$'
-    }
-    symbol = symbols.get(str(currency).upper(), str(currency))
-
-    negative = val < 0
-    val = abs(val)
-
-    # Formatear primero con separadores estilo US: 1,234.56
-    s = f"{val:,.2f}"
-
-    # Convertir a estilo es-AR: 1.234,56
-    # Usar un placeholder para evitar colisiones
-    s = s.replace(',', 'X').replace('.', ',').replace('X', '.')
+        return _format_cached(value, str(currency))
+    except TypeError:
+        # valor no hasheable: formatear sin cache
+        return _format(value, str(currency))
 
-    # Devolver con el símbolo pegado al número (sin espacios extra),
-    # y poner el signo menos antes del símbolo para valores negativos.
-    if negative:
-        return f"-{symbol}{s}"
-    return f"{symbol}{s}"
@@ -0,0 +1,243 @@
+import os
+import random
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import MonthPeriod, Transaction
+from .services import LedgerTotals, MonthCloser, RunningBalance, month_sequence
+
+MONTHS = month_sequence((2024, 1), (2024, 6))
+SNAPSHOT_FIELDS = [
+    'year', 'month', 'is_closed', 'opening_balance', 'income', 'expense',
+    'adjustments_positive', 'adjustments_negative', 'net', 'row_count',
+]
+
+
+def random_ledger(seed, rows=300):
+    """Cargar `rows` movimientos al azar entre enero y junio de 2024.
+
+    Los egresos pesan más en algunos meses para que haya netos negativos (traslado EX)
+    además de positivos, y los ajustes tienen los dos signos.
+    """
+    rnd = random.Random(seed)
+    first, last = date(2024, 1, 1), date(2024, 6, 30)
+    objs = []
+    for _ in range(rows):
+        day = first + timedelta(days=rnd.randrange((last - first).days + 1))
+        ttype = rnd.choice([Transaction.INCOME, Transaction.EXPENSE, Transaction.ADJUSTMENT])
+        amount = Decimal(rnd.randrange(1, 500000)) / 100
+        if ttype == Transaction.EXPENSE:
+            amount = (amount * (3 if day.month in (2, 5) else Decimal('0.5'))).quantize(Decimal('0.01'))
+        if ttype == Transaction.ADJUSTMENT and rnd.random() < 0.5:
+            amount = -amount
+        objs.append(Transaction(date=day, type=ttype, amount=amount, description='mov'))
+    Transaction.objects.bulk_create(objs)
+
+
+def naive_totals(rows):
+    """Totales recorriendo las filas en Python, sin snapshots."""
+    income = sum((t.amount for t in rows if t.type == Transaction.INCOME), Decimal('0'))
+    expense = sum((t.amount for t in rows if t.type == Transaction.EXPENSE), Decimal('0'))
+    adj_positive = sum((t.amount for t in rows if t.type == Transaction.ADJUSTMENT and t.amount >= 0), Decimal('0'))
+    adj_negative = sum((t.amount for t in rows if t.type == Transaction.ADJUSTMENT and t.amount < 0), Decimal('0'))
+    return LedgerTotals._build(income, expense, adj_positive, adj_negative, len(rows))
+
+
+class LedgerTestCase(TestCase):
+    def setUp(self):
+        # meses cerrados y versiones del libro viven en el cache, no en la base
+        cache.clear()
+
+    def ledger_state(self):
+        periods = list(MonthPeriod.objects.order_by('year', 'month').values_list(*SNAPSHOT_FIELDS))
+        carries = list(
+            Transaction.objects.filter(description__startswith='Saldo trasladado')
+            .order_by('date').values_list('date', 'type', 'amount', 'description')
+        )
+        return periods, carries
+
+
+class MonthCloseTests(LedgerTestCase):
+    def test_close_range_matches_closing_month_by_month(self):
+        random_ledger(seed=1)
+        months = MONTHS[:4]
+
+        sid = transaction.savepoint()
+        for year, month in months:
+            period, _ = MonthPeriod.objects.get_or_create(year=year, month=month)
+            MonthCloser(period).close()
+        one_by_one = self.ledger_state()
+        transaction.savepoint_rollback(sid)
+        cache.clear()
+
+        results = MonthCloser.close_range(months[0], months[-1])
+        self.assertEqual(self.ledger_state(), one_by_one)
+        self.assertEqual([r['net'] for r in results], [p[SNAPSHOT_FIELDS.index('net')] for p in one_by_one[0][:4]])
+        # hay traslados de ambos signos
+        self.assertEqual({c[1] for c in one_by_one[1]}, {Transaction.INCOME, Transaction.EXPENSE})
+
+    def test_snapshot_matches_transactions_of_the_month(self):
+        random_ledger(seed=2)
+        MonthCloser.close_range(MONTHS[0], MONTHS[2])
+        for period in MonthPeriod.objects.filter(is_closed=True):
+            rows = [t for t in Transaction.objects.all() if (t.date.year, t.date.month) == (period.year, period.month)]
+            totals = naive_totals(rows)
+            self.assertEqual(period.net, totals['net'])
+            self.assertEqual(period.row_count, totals['count'])
+            self.assertEqual(period.adjustments_negative, totals['adjustments_negative'])
+
+
+    def test_close_months_command_rejects_invalid_months(self):
+        for desde, hasta in [('0-01', '0-02'), ('2024-13', '2024-12'), ('2024-01', '10000-01'), ('2024', '2024-02')]:
+            with self.subTest(desde=desde, hasta=hasta):
+                with self.assertRaisesMessage(CommandError, 'Mes inválido'):
+                    call_command('close_months', desde, hasta, stdout=StringIO())
+        self.assertFalse(MonthPeriod.objects.exists())
+
+class ComputeRangeTests(LedgerTestCase):
+    def test_compute_range_equals_compute_over_same_range(self):
+        random_ledger(seed=3)
+        MonthCloser.close_range(MONTHS[0], MONTHS[1])
+        MonthCloser.close_range(MONTHS[3], MONTHS[3])
+        ranges = [
+            (None, None),
+            (date(2024, 1, 1), date(2024, 6, 30)),
+            (date(2024, 1, 15), date(2024, 4, 10)),
+            (date(2024, 2, 1), date(2024, 2, 29)),
+            (date(2024, 3, 31), date(2024, 5, 1)),
+            (None, date(2024, 3, 31)),
+            (date(2024, 4, 1), None),
+        ]
+        for date_from, date_to in ranges:
+            with self.subTest(date_from=date_from, date_to=date_to):
+                qs = Transaction.objects.all()
+                if date_from:
+                    qs = qs.filter(date__gte=date_from)
+                if date_to:
+                    qs = qs.filter(date__lte=date_to)
+                self.assertEqual(LedgerTotals.compute_range(date_from, date_to), LedgerTotals.compute(qs))
+                self.assertEqual(LedgerTotals.compute(qs), naive_totals(list(qs)))
+
+
+class RunningBalanceTests(LedgerTestCase):
+    def expected_balances(self):
+        """Saldo de cada fila recalculado desde cero: suma con signo desde el mes
+        siguiente al último mes cerrado anterior al de la fila."""
+        closed = set(MonthPeriod.objects.filter(is_closed=True).values_list('year', 'month'))
+        rows = list(Transaction.objects.order_by('date', 'id'))
+        expected = {}
+        for i, t in enumerate(rows):
+            key = (t.date.year, t.date.month)
+            last_closed = max((p for p in closed if p < key), default=None)
+            expected[t.pk] = sum(
+                (-r.amount if r.type == Transaction.EXPENSE else r.amount)
+                for r in rows[:i + 1]
+                if last_closed is None or (r.date.year, r.date.month) > last_closed
+            )
+        return rows, expected
+
+    def test_pages_crossing_closed_months_in_both_orders(self):
+        random_ledger(seed=4, rows=150)
+        MonthCloser.close_range(MONTHS[1], MONTHS[2])
+        rows, expected = self.expected_balances()
+        descending = rows[::-1]
+        for ordered in (rows, descending):
+            for start in range(0, len(ordered), 17):
+                page = [Transaction.objects.get(pk=t.pk) for t in ordered[start:start + 17]]
+                RunningBalance.annotate(page)
+                for t in page:
+                    self.assertEqual(t.balance, expected[t.pk], f'{t.date} #{t.pk}')
+
+
+class ImportTransactionsTests(LedgerTestCase):
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def write(self, name, content, encoding='utf-8'):
+        path = os.path.join(self.tmp, name)
+        with open(path, 'w', encoding=encoding, newline='') as fh:
+            fh.write(content)
+        return path
+
+    def run_import(self, *args):
+        out, err = StringIO(), StringIO()
+        call_command('import_transactions', *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def rows(self):
+        return sorted(Transaction.objects.values_list('date', 'type', 'amount', 'description'))
+
+    def test_report_csv_export_imports_back_unchanged(self):
+        random_ledger(seed=5, rows=80)
+        Transaction.objects.filter(pk__in=Transaction.objects.order_by('pk')[:3]).update(description='con, "comillas"')
+        before = self.rows()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        resp = self.client.get(reverse('cooperadora:transaction_report'), {'format': 'csv'})
+        path = self.write('export.csv', b''.join(resp.streaming_content).decode())
+        Transaction.objects.all().delete()
+
+        out, err = self.run_import(path)
+        self.assertEqual(self.rows(), before)
+        # solo se rechazan las dos filas de totales del pie
+        self.assertIn('Importadas 80 de 82 filas (2 rechazadas)', out)
+        self.assertIn("fecha inválida: 'Totales'", err)
+
+    def test_rejected_rows_are_reported_and_the_rest_imported(self):
+        MonthPeriod.objects.create(year=2024, month=1, is_closed=True)
+        path = self.write('rows.csv', (
+            'date,type,amount,description\n'
+            '2024-02-01,IN,100.00,cuota\n'
+            '2024-02-31,IN,10,fecha\n'
+            '2024-02-02,XX,10,tipo\n'
+            '2024-02-03,EX,abc,monto\n'
+            '2024-02-04,EX,nan,monto\n'
+            '2024-01-10,IN,10,mes cerrado\n'
+            '2024-02-05,Egreso,25.50,luz\n'
+        ))
+        out, err = self.run_import(path)
+        self.assertEqual(self.rows(), [
+            (date(2024, 2, 1), Transaction.INCOME, Decimal('100.00'), 'cuota'),
+            (date(2024, 2, 5), Transaction.EXPENSE, Decimal('25.50'), 'luz'),
+        ])
+        self.assertIn('Importadas 2 de 7 filas (5 rechazadas)', out)
+        errors = dict(line.split(': ', 1) for line in err.splitlines())
+        for line_no, reason in [(3, 'fecha inválida'), (4, 'tipo inválido'), (5, 'abc'),
+                                (6, 'nan'), (7, 'mes cerrado: 2024-01')]:
+            self.assertIn(reason, errors[f'{path}:{line_no}'])
+
+    def test_dry_run_validates_without_saving(self):
+        path = self.write('rows.jsonl', (
+            '{"date": "2024-03-01", "type": "IN", "amount": "50"}\n'
+            'no es json\n'
+            '{"date": "2024-03-02", "type": "AJ", "amount": "-5"}\n'
+        ))
+        out, err = self.run_import(path, '--dry-run')
+        self.assertIn('Validadas 2 de 3 filas (1 rechazadas)', out)
+        self.assertIn(f'{path}:2: fila ilegible', err)
+        self.assertFalse(Transaction.objects.exists())
+        self.assertFalse(MonthPeriod.objects.exists())
+
+    def test_unreadable_files_raise_command_error_with_the_path(self):
+        cases = {
+            'missing.csv': None,
+            'latin1.csv': ('date,type,amount,description\n2024-03-01,IN,10,cuota año\n', 'latin-1'),
+            'huge.csv': ('date,type,amount,description\n2024-03-01,IN,10,"' + 'x' * 200000 + '"\n', 'utf-8'),
+        }
+        for name, content in cases.items():
+            with self.subTest(name):
+                path = os.path.join(self.tmp, name) if content is None else self.write(name, *content)
+                with self.assertRaisesMessage(CommandError, f'No se pudo leer {path}'):
+                    self.run_import(path)
+        self.assertFalse(Transaction.objects.exists())
@@ -1,12 +1,27 @@
-from django.shortcuts import render, redirect
+import csv
+from datetime import date
+from decimal import Decimal
+
+from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
+from django.utils.dateparse import parse_date
+from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
 
-from .models import Transaction
+from core.pagination import KeysetPaginator
+from core.streaming import streaming_response
+
+from .models import MonthPeriod, Transaction
 from .forms import TransactionForm
 from . import services
 
+# Paginación de las vistas de transacciones (?page_size= dentro de [1, MAX_PAGE_SIZE])
+PAGE_SIZE = 10
+MAX_PAGE_SIZE = 500
+PAGE_SIZE_CHOICES = [10, 25, 50, 100, 500]
+
 
 def index(request):
     return render(request, 'cooperadora/index.html', {})
@@ -22,39 +37,28 @@ class TransactionListView(LoginRequiredMixin, PermissionRequiredMixin, ListView)
         """Agregar al contexto la separación de ingresos/egresos y los totales."""
         ctx = super().get_context_data(**kwargs)
         # Mostrar transacciones de la más reciente a la más antigua
-        qs = self.get_queryset().order_by('-date')
-        # Si no se pasa ?all=1, limitar la vista a 10 registros
-        show_all = self.request.GET.get('all') == '1'
-        total_count = qs.count()
-        if not show_all:
-            limited = total_count > 10
-            limited_qs = qs[:10]
-        else:
-            limited = False
-            limited_qs = qs
-        from decimal import Decimal
-
-        # Calcular totales usando el conjunto completo (filtrado) para que los totales
-        # reflejen todos los movimientos, incluso cuando la vista está limitada.
-        total_income = Decimal('0')
-        total_expense = Decimal('0')
-        for t in qs:
-            amt = t.amount
-            if t.type == Transaction.INCOME:
-                total_income += Decimal(amt)
-            elif t.type == Transaction.EXPENSE:
-                total_expense += -Decimal(amt)
-            else:  # ADJUSTMENT
-                if amt >= 0:
-                    total_income += Decimal(amt)
-                else:
-                    total_expense += Decimal(amt)
-
-        total_general = total_income + total_expense
-
-        # Construir filas solo para la vista (limitada o no)
+        qs = self.get_queryset()
+        # Calcular totales en la base de datos sobre el conjunto completo para que los totales
+        # reflejen todos los movimientos, incluso cuando la vista está limitada. Los meses
+        # cerrados se suman desde sus snapshots; el resultado queda en cache hasta la
+        # próxima escritura en el libro.
+        totals = services.LedgerTotals.cached_range()
+        total_income = totals['total_income']
+        total_expense = totals['total_expense']
+        total_general = totals['total_general']
+        total_count = totals['count']
+
+        # Paginar por cursor sobre (fecha, id): cada página es una consulta de rango
+        # indexada, sin OFFSET, sin importar cuán atrás se navegue en el historial
+        page = KeysetPaginator(qs, ordering=['-date', '-id'], page_size=PAGE_SIZE,
+                               max_page_size=MAX_PAGE_SIZE).page_from_request(self.request)
+
+        # Saldo acumulado de cada fila (función de ventana en la base)
+        services.RunningBalance.annotate(page.object_list)
+
+        # Construir filas solo para la página actual
         rows = []
-        for t in limited_qs:
+        for t in page.object_list:
             amt = t.amount
             income_col = None
             expense_col = None
@@ -74,6 +78,7 @@ class TransactionListView(LoginRequiredMixin, PermissionRequiredMixin, ListView)
                 'type': t.get_type_display(),
                 'income': income_col,
                 'expense': expense_col,
+                'balance': t.balance,
                 'description': t.description or '',
             })
         ctx.update({
@@ -81,7 +86,8 @@ class TransactionListView(LoginRequiredMixin, PermissionRequiredMixin, ListView)
             'total_income': total_income,
             'total_expense': total_expense,
             'total_general': total_general,
-            'limited': limited,
+            'page': page,
+            'page_sizes': PAGE_SIZE_CHOICES,
             'total_count': total_count,
         })
         return ctx
@@ -98,7 +104,6 @@ class TransactionCreateView(LoginRequiredMixin, PermissionRequiredMixin, CreateV
         """Proveer datos iniciales para el formulario (fecha por defecto = hoy)."""
         initial = super().get_initial()
     # TransactionForm ya establece hoy como valor por defecto, pero lo dejamos explícito
-        from datetime import date
         initial.setdefault('date', date.today())
         return initial
 
@@ -117,24 +122,16 @@ class TransactionDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteV
     permission_required = 'cooperadora.delete_transaction'
 
 
-
-
-
-from django.views import View
-from django.shortcuts import get_object_or_404
-from django.contrib import messages
-
-
 class CloseMonthView(LoginRequiredMixin, PermissionRequiredMixin, View):
     permission_required = 'cooperadora.close_month'
 
     def get(self, request, year, month):
         # mostrar confirmación
-        mp = get_object_or_404(__import__('cooperadora.models', fromlist=['MonthPeriod']).models.MonthPeriod, year=year, month=month)
+        mp = get_object_or_404(MonthPeriod, year=year, month=month)
         return render(request, 'cooperadora/close_month_confirm.html', {'period': mp})
 
     def post(self, request, year, month):
-        mp = get_object_or_404(__import__('cooperadora.models', fromlist=['MonthPeriod']).models.MonthPeriod, year=year, month=month)
+        mp = get_object_or_404(MonthPeriod, year=year, month=month)
         try:
             # Usar la capa de servicios MonthCloser para el comportamiento de cierre
             result = services.MonthCloser(mp, user=request.user).close()
@@ -147,10 +144,50 @@ class CloseMonthView(LoginRequiredMixin, PermissionRequiredMixin, View):
         return redirect('cooperadora:index')
 
 
-from django.http import HttpResponse
-import csv
-from django.utils.dateparse import parse_date
-from decimal import Decimal
+# Filas leídas por viaje a la base al exportar CSV
+CSV_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: devuelve la línea en vez de acumularla."""
+
+    def write(self, value):
+        return value
+
+
+def _stream_report_csv(qs, totals):
+    """Generar el CSV del reporte línea por línea.
+
+    Recorre `qs` con `values_list(...).iterator()` para mantener la memoria
+    constante sin importar la cantidad de filas; el pie de totales viene de
+    `totals` (calculado con LedgerTotals).
+    """
+    writer = csv.writer(_Echo())
+    type_labels = dict(Transaction.TYPE_CHOICES)
+    yield writer.writerow(['date', 'type', 'income', 'expense', 'description'])
+    rows = qs.order_by('date', 'id').values_list('date', 'type', 'amount', 'description')
+    for date_, ttype, amt, description in rows.iterator(chunk_size=CSV_CHUNK_SIZE):
+        income_col = ''
+        expense_col = ''
+        if ttype == Transaction.INCOME:
+            income_col = str(amt)
+        elif ttype == Transaction.EXPENSE:
+            expense_col = str(-amt)
+        elif amt >= 0:  # ADJUSTMENT
+            income_col = str(amt)
+        else:
+            expense_col = str(amt)
+        yield writer.writerow([
+            date_.isoformat(),
+            type_labels.get(ttype, ttype),
+            income_col,
+            expense_col,
+            description or '',
+        ])
+    # Fila de totales
+    yield writer.writerow([])
+    yield writer.writerow(['Totales', '', str(totals['total_income']), str(totals['total_expense']), ''])
+    yield writer.writerow(['Total general', '', str(totals['total_general']), '', ''])
 
 
 class TransactionReportView(LoginRequiredMixin, PermissionRequiredMixin, View):
@@ -166,52 +203,51 @@ class TransactionReportView(LoginRequiredMixin, PermissionRequiredMixin, View):
         qs = Transaction.objects.all().order_by('date')
 
         errors = []
+        date_from = date_to = None
         if desde:
             d = parse_date(desde)
             if not d:
                 errors.append('Fecha "desde" inválida')
             else:
+                date_from = d
                 qs = qs.filter(date__gte=d)
         if hasta:
             h = parse_date(hasta)
             if not h:
                 errors.append('Fecha "hasta" inválida')
             else:
+                date_to = h
                 qs = qs.filter(date__lte=h)
 
         # Preparar conjunto completo (filtrado) para cálculos de totales
         full_qs = qs
 
-        # Calcular totales sobre el conjunto completo (filtrado)
-        total_income = Decimal('0')
-        total_expense = Decimal('0')
-        for t in full_qs:
-            amt = t.amount
-            if t.type == Transaction.INCOME:
-                total_income += Decimal(amt)
-            elif t.type == Transaction.EXPENSE:
-                total_expense += -Decimal(amt)
-            else:
-                if amt >= 0:
-                    total_income += Decimal(amt)
-                else:
-                    total_expense += Decimal(amt)
+        # Calcular totales sobre el conjunto completo (filtrado): meses cerrados desde sus
+        # snapshots y una sola consulta agregada para el resto del rango
+        totals = services.LedgerTotals.cached_range(date_from, date_to)
+        total_income = totals['total_income']
+        total_expense = totals['total_expense']
+        total_general = totals['total_general']
+
+        # Si se solicita CSV, enviarlo en streaming: todas las filas del rango, sin
+        # cargarlas en memoria (ignora el límite de 10 filas de la vista HTML). Con ASGI
+        # el cuerpo se envía de a bloques sin bloquear el event loop.
+        if fmt == 'csv' and not errors:
+            resp = streaming_response(request, _stream_report_csv(full_qs, totals), content_type='text/csv')
+            resp['Content-Disposition'] = 'attachment; filename="cooperadora_report.csv"'
+            return resp
 
-        total_general = total_income + total_expense
+        # Paginar por cursor sobre (fecha, id), en orden cronológico
+        total_count = totals['count']
+        page = KeysetPaginator(full_qs, ordering=['date', 'id'], page_size=PAGE_SIZE,
+                               max_page_size=MAX_PAGE_SIZE).page_from_request(request)
 
-        # Si no se pasa ?all=1, limitar la vista a 10 registros
-        show_all = request.GET.get('all') == '1'
-        total_count = full_qs.count()
-        if not show_all:
-            limited = total_count > 10
-            qs_display = full_qs[:10]
-        else:
-            limited = False
-            qs_display = full_qs
+        # Saldo acumulado de cada fila (función de ventana en la base)
+        services.RunningBalance.annotate(page.object_list)
 
         # Construir filas con columnas separadas para ingreso/egreso (para la vista)
         rows = []
-        for t in qs_display:
+        for t in page.object_list:
             amt = t.amount
             income_col = None
             expense_col = None
@@ -233,32 +269,13 @@ class TransactionReportView(LoginRequiredMixin, PermissionRequiredMixin, View):
                 'type': t.get_type_display(),
                 'income': income_col,
                 'expense': expense_col,
+                'balance': t.balance,
                 'description': t.description or '',
             })
 
         # Total neto (ingresos + egresos, donde los egresos están como negativos)
         # (ya calculado más arriba sobre el conjunto completo)
 
-        # Si se solicita CSV, enviarlo en streaming con columnas separadas
-        if fmt == 'csv' and not errors:
-            resp = HttpResponse(content_type='text/csv')
-            resp['Content-Disposition'] = 'attachment; filename="cooperadora_report.csv"'
-            writer = csv.writer(resp)
-            writer.writerow(['date', 'type', 'income', 'expense', 'description'])
-            for r in rows:
-                writer.writerow([
-                    r['date'].isoformat(),
-                    r['type'],
-                    str(r['income']) if r['income'] is not None else '',
-                    str(r['expense']) if r['expense'] is not None else '',
-                    r['description'],
-                ])
-            # Fila de totales
-            writer.writerow([])
-            writer.writerow(['Totales', '', str(total_income), str(total_expense), ''])
-            writer.writerow(['Total general', '', str(total_general), '', ''])
-            return resp
-
         return render(request, 'cooperadora/report.html', {
             'transactions': rows,
             'errors': errors,
@@ -267,6 +284,8 @@ class TransactionReportView(LoginRequiredMixin, PermissionRequiredMixin, View):
             'total_income': total_income,
             'total_expense': total_expense,
             'total_general': total_general,
-            'limited': limited,
+            'page': page,
+            'page_size': page.page_size,
+            'page_sizes': PAGE_SIZE_CHOICES,
             'total_count': total_count,
         })
@@ -1,6 +1,50 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Mantener coherente el cache de roles/grupos/permisos de `user_context`
+        from django.contrib.auth.models import Group, User
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+        from .models import Profile, Role
+
+        m2m_changed.connect(user_access_m2m_changed, sender=User.groups.through)
+        m2m_changed.connect(user_access_m2m_changed, sender=User.user_permissions.through)
+        m2m_changed.connect(user_access_m2m_changed, sender=Profile.roles.through)
+        m2m_changed.connect(invalidate_all_user_access, sender=Group.permissions.through)
+        for model in (Group, Role):
+            post_save.connect(invalidate_all_user_access, sender=model)
+            post_delete.connect(invalidate_all_user_access, sender=model)
+        post_save.connect(invalidate_user_access, sender=User)
+        post_delete.connect(invalidate_user_access, sender=Profile)
+
+
+def user_access_m2m_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Invalidar solo los usuarios afectados por un cambio en sus grupos, permisos o roles."""
+    if not action.startswith('post_'):
+        return
+    from .services import UserAccessCache
+    if not reverse:
+        # instance es el User (o su Profile)
+        UserAccessCache.invalidate_user([getattr(instance, 'user_id', instance.pk)])
+    elif action == 'post_clear' or not pk_set:
+        # desde el otro lado (group.user_set.clear(), role.profile_set...): no se sabe a quién afecta
+        UserAccessCache.invalidate_all()
+    elif sender is apps.get_model('core', 'Profile').roles.through:
+        Profile = apps.get_model('core', 'Profile')
+        UserAccessCache.invalidate_user(list(Profile.objects.filter(pk__in=pk_set).values_list('user_id', flat=True)))
+    else:
+        UserAccessCache.invalidate_user(list(pk_set))
+
+
+def invalidate_user_access(sender, instance, **kwargs):
+    from .services import UserAccessCache
+    UserAccessCache.invalidate_user([getattr(instance, 'user_id', instance.pk)])
+
+
+def invalidate_all_user_access(sender, **kwargs):
+    from .services import UserAccessCache
+    UserAccessCache.invalidate_all()
@@ -1,48 +1,46 @@
+from django.conf import settings
+from django.utils.functional import SimpleLazyObject
+
+
 def user_context(request):
     """Contexto común para plantillas: roles del usuario y notificaciones (stub).
 
     Devuelve:
       - user_roles: lista de nombres de roles asignados al usuario (si existe Profile)
+      - user_groups: lista de nombres de grupos del usuario
+      - user_perms: conjunto de permisos 'app_label.codename' (incluye '__all__' si es superusuario)
+      - sidebar_menu: enlaces y roles del menú lateral con la clave de su fragmento
+        cacheado (ver `core.services.SidebarMenu`)
       - notifications: lista vacía de notificaciones (placeholder)
       - unread_notifications_count: entero
+
+    Roles, grupos y permisos se resuelven de forma diferida y una sola vez por
+    request (ver `core.services.UserAccessCache`): las páginas que no los leen no
+    hacen ninguna consulta ni acceso al cache.
     """
-    roles = []
+    user = getattr(request, 'user', None)
+
+    def resolve():
+        if user is None or not user.is_authenticated:
+            return {'roles': [], 'groups': [], 'perms': frozenset()}
+        from core.services import UserAccessCache
+        return UserAccessCache.get(user)
+
+    access = SimpleLazyObject(resolve)
+
+    def sidebar():
+        from core.services import SidebarMenu
+        return SidebarMenu.for_user(user, access)
+
+    # Placeholder: en el futuro leer model Notification relacionado al usuario
     notifications = []
     unread_count = 0
-    user_groups = []
-    user_perms = set()
-    user = getattr(request, 'user', None)
-    if user and user.is_authenticated:
-        try:
-            profile = user.profile
-            roles = [r.name for r in profile.roles.all()]
-        except Exception:
-            roles = []
-        # user groups
-        try:
-            user_groups = [g.name for g in user.groups.all()]
-            # grupos del usuario
-        except Exception:
-            user_groups = []
-        # permissions as 'app_label.codename'
-        try:
-            user_perms = set([f"{p.content_type.app_label}.{p.codename}" for p in user.user_permissions.all()])
-            # also include perms from groups
-            for g in user.groups.all():
-                for p in g.permissions.all():
-                    user_perms.add(f"{p.content_type.app_label}.{p.codename}")
-            # superusers have all perms
-            if user.is_superuser:
-                user_perms.add('__all__')
-        except Exception:
-            user_perms = set()
-        # Placeholder: en el futuro leer model Notification relacionado al usuario
-        notifications = []
-        unread_count = 0
     return {
-        'user_roles': roles,
-        'user_groups': user_groups,
-        'user_perms': user_perms,
+        'user_roles': SimpleLazyObject(lambda: access['roles']),
+        'user_groups': SimpleLazyObject(lambda: access['groups']),
+        'user_perms': SimpleLazyObject(lambda: access['perms']),
+        'sidebar_menu': SimpleLazyObject(sidebar),
+        'sidebar_menu_timeout': settings.SIDEBAR_MENU_CACHE_TIMEOUT,
         'notifications': notifications,
         'unread_notifications_count': unread_count,
     }
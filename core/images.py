@@ -0,0 +1,58 @@
+"""Variantes WebP redimensionadas de los logos e íconos del sitio.
+
+Los PNG originales de `graphics/` miden hasta 1280 px (y los íconos de la barra
+superior pesan 1,5 MB cada uno) pero se muestran a 26-160 px. Para cada imagen
+de `IMAGE_VARIANTS` se generan WebP a los anchos indicados (1x y 2x de su tamaño
+en pantalla) en `static/img/`, con el comando `manage.py optimize_images`; las
+plantillas los usan con el tag `{% picture %}` (core/templatetags/images.py) y
+el PNG queda como respaldo.
+"""
+import os
+from pathlib import Path
+
+from django.conf import settings
+
+# imagen de graphics/ -> anchos en píxeles de las variantes WebP
+IMAGE_VARIANTS = {
+    'FullLogo_Transparent.png': (90, 160, 180, 320, 650),
+    'Acceso_garantizado.png': (26, 52),
+    'Salir.png': (26, 52),
+    'Accesso.png': (32, 64),
+}
+
+SOURCE_DIR = Path(settings.BASE_DIR) / 'graphics'
+OUTPUT_DIR = Path(settings.BASE_DIR) / 'static' / 'img'
+# ruta estática de OUTPUT_DIR (está dentro de static/, que figura en STATICFILES_DIRS)
+OUTPUT_PREFIX = 'img/'
+WEBP_QUALITY = 85
+
+
+def variant_name(source, width):
+    """Nombre estático de una variante: 'Salir.png', 52 -> 'img/Salir-52.webp'."""
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return f'{OUTPUT_PREFIX}{stem}-{width}.webp'
+
+
+def build_variants(force=False):
+    """Generar las variantes que falten o sean más viejas que su PNG.
+
+    Devuelve una lista de (nombre, bytes) de los archivos escritos.
+    """
+    from PIL import Image
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    written = []
+    for source, widths in IMAGE_VARIANTS.items():
+        source_path = SOURCE_DIR / source
+        mtime = source_path.stat().st_mtime
+        with Image.open(source_path) as image:
+            image.load()
+            for width in widths:
+                target = OUTPUT_DIR / Path(variant_name(source, width)).name
+                if not force and target.exists() and target.stat().st_mtime >= mtime:
+                    continue
+                height = round(image.height * width / image.width)
+                resized = image.resize((width, height), Image.LANCZOS)
+                resized.save(target, 'WEBP', quality=WEBP_QUALITY, method=6)
+                written.append((variant_name(source, width), target.stat().st_size))
+    return written
@@ -0,0 +1,24 @@
+"""Generar las variantes WebP de logos e íconos (ver core.images).
+
+Correr antes de `collectstatic` (el Dockerfile lo hace); solo regenera las
+variantes que falten o sean más viejas que su PNG, salvo con --force.
+
+Ejemplo:
+    py manage.py optimize_images
+"""
+from django.core.management.base import BaseCommand
+
+from core.images import build_variants
+
+
+class Command(BaseCommand):
+    help = 'Genera variantes WebP redimensionadas de los logos e íconos en static/img/.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='regenerar aunque estén al día')
+
+    def handle(self, *args, **options):
+        written = build_variants(force=options['force'])
+        for name, size in written:
+            self.stdout.write(f'{name}: {size / 1024:.1f} KB')
+        self.stdout.write(self.style.SUCCESS(f'{len(written)} variantes generadas.'))
@@ -0,0 +1,124 @@
+"""Middleware opcional de instrumentación: consultas SQL y tiempos por request.
+
+Se activa con `QUERY_STATS_ENABLED = True` (variable de entorno QUERY_STATS=True);
+desactivado, Django lo descarta al arrancar (MiddlewareNotUsed) y no cuesta nada.
+
+Por request registra:
+- cantidad de consultas y tiempo total en la base (todas las conexiones);
+- consultas repetidas, agrupadas por "huella" (el SQL con parámetros y listas
+  IN (...) colapsadas), que es la firma típica de un N+1;
+- tiempo total del request y tiempo fuera de la base.
+
+Los expone en el header `Server-Timing` (visible en las herramientas del
+navegador) y en una línea de log JSON en el logger `impulsa.query_stats`:
+DEBUG para cada request y WARNING, con las peores huellas y las consultas más
+lentas, cuando se supera `QUERY_STATS_MAX_QUERIES` o `QUERY_STATS_MAX_DB_MS`.
+
+Las consultas que hace una StreamingHttpResponse mientras se envía el cuerpo no
+se cuentan (ocurren después de que el middleware devolvió la respuesta).
+"""
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('impulsa.query_stats')
+
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r'\bVALUES\s*(?:\((?:\s*%s\s*,?)+\)\s*,?\s*)+', re.IGNORECASE)
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint(sql):
+    """Normalizar el SQL para agrupar consultas iguales salvo por sus parámetros."""
+    sql = _LITERALS.sub('%s', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _VALUES_LIST.sub('VALUES (...) ', sql)
+    return ' '.join(sql.split())
+
+
+class QueryRecorder:
+    """`execute_wrapper` que acumula cantidad, duración y huella de cada consulta."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            self.fingerprints[fingerprint(sql)] += 1
+            self.slowest.append((elapsed, sql))
+            if len(self.slowest) > 20:
+                self.slowest.sort(reverse=True)
+                del self.slowest[10:]
+
+    def duplicates(self, limit):
+        return [(sql, n) for sql, n in self.fingerprints.most_common(limit) if n > 1]
+
+    def top_slowest(self, limit):
+        return sorted(self.slowest, reverse=True)[:limit]
+
+
+class QueryStatsMiddleware:
+    """Cuenta consultas y mide tiempos por request (ver docstring del módulo)."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_STATS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.max_queries = getattr(settings, 'QUERY_STATS_MAX_QUERIES', 50)
+        self.max_db_ms = getattr(settings, 'QUERY_STATS_MAX_DB_MS', 500)
+        self.top = getattr(settings, 'QUERY_STATS_TOP', 5)
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = recorder.duration * 1000
+        duplicates = recorder.duplicates(self.top)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.1f};desc="{recorder.count} queries"',
+            f'app;dur={total_ms - db_ms:.1f}',
+            f'total;dur={total_ms:.1f}',
+        ])
+
+        match = getattr(request, 'resolver_match', None)
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'duplicated_queries': sum(n - 1 for _sql, n in recorder.fingerprints.items() if n > 1),
+            'db_ms': round(db_ms, 1),
+            'total_ms': round(total_ms, 1),
+        }
+        if recorder.count > self.max_queries or db_ms > self.max_db_ms:
+            record['top_duplicates'] = [{'count': n, 'sql': sql} for sql, n in duplicates]
+            record['top_slowest'] = [
+                {'ms': round(elapsed * 1000, 1), 'sql': ' '.join(sql.split())}
+                for elapsed, sql in recorder.top_slowest(self.top)
+            ]
+            logger.warning('query_stats %s', json.dumps(record, ensure_ascii=False))
+        else:
+            logger.debug('query_stats %s', json.dumps(record, ensure_ascii=False))
+        return response
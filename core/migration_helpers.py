@@ -0,0 +1,65 @@
+"""Código compartido por las migraciones de datos de búsqueda de personas.
+
+Las migraciones tienen que dar siempre el mismo resultado, así que acá se copian
+(congeladas) las normalizaciones tal como estaban al crear las columnas, en vez
+de importar las de `core.services`, que pueden cambiar. No modificar estas
+funciones: si cambia la normalización, escribir una migración nueva.
+
+Lo usan students/migrations/0003, 0006 y teachers/migrations/0003, 0005.
+"""
+import re
+import unicodedata
+
+
+def normalize_search(text):
+    """Minúsculas, sin acentos y con espacios simples ('Pérez  Ñoño' -> 'perez nono')."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+
+def normalize_dni(text):
+    """Solo los dígitos del DNI ('20.123.456' -> '20123456')."""
+    return re.sub(r'\D', '', text or '')
+
+
+def backfill_search_columns(app_label, model_name):
+    """RunPython que completa search_name ("apellido nombre") y search_dni."""
+    def backfill(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        rows = list(model.objects.only('id', 'first_name', 'last_name', 'dni'))
+        for row in rows:
+            row.search_name = normalize_search(f"{row.last_name} {row.first_name}")
+            row.search_dni = normalize_dni(row.dni)
+        model.objects.bulk_update(rows, ['search_name', 'search_dni'], batch_size=1000)
+    return backfill
+
+
+def backfill_search_name_first(app_label, model_name):
+    """RunPython que completa search_name_first ("nombre apellido")."""
+    def backfill(apps, schema_editor):
+        model = apps.get_model(app_label, model_name)
+        rows = list(model.objects.only('id', 'first_name', 'last_name'))
+        for row in rows:
+            row.search_name_first = normalize_search(f"{row.first_name} {row.last_name}")
+        model.objects.bulk_update(rows, ['search_name_first'], batch_size=1000)
+    return backfill
+
+
+def trigram_index(table, index_name):
+    """Par (crear, borrar) de RunPython para un índice GIN de trigramas sobre
+    `table.search_name`. Solo actúa en PostgreSQL."""
+    def create(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin (search_name gin_trgm_ops)'
+        )
+
+    def drop(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+    return create, drop
@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from .services import normalize_dni, normalize_search
+
 
 class Role(models.Model):
     """Representa un rol de acceso por módulo o global."""
@@ -37,9 +39,29 @@ class Person(models.Model):
     # Teléfonos
     phone_primary = models.CharField('teléfono principal', max_length=50, blank=True)
     phone_secondary = models.CharField('teléfono secundario', max_length=50, blank=True)
+    # Columnas de búsqueda (minúsculas, sin acentos), mantenidas en save()
+    search_name = models.CharField(max_length=201, blank=True, editable=False)
+    # "nombre apellido": para buscar por prefijo del nombre en motores sin trigramas
+    search_name_first = models.CharField(max_length=201, blank=True, editable=False)
+    search_dni = models.CharField(max_length=20, blank=True, editable=False)
 
     class Meta:
         abstract = True
+        indexes = [
+            # (search_name, id): búsqueda por prefijo y paginación por cursor en el mismo índice
+            models.Index(fields=['search_name', 'id'], name='%(app_label)s_%(class)s_sname_idx'),
+            models.Index(fields=['search_dni'], name='%(app_label)s_%(class)s_sdni_idx'),
+            models.Index(fields=['search_name_first'], name='%(app_label)s_%(class)s_snamef_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.search_name = normalize_search(f"{self.last_name} {self.first_name}")
+        self.search_name_first = normalize_search(f"{self.first_name} {self.last_name}")
+        self.search_dni = normalize_dni(self.dni)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'search_name', 'search_name_first', 'search_dni'}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.last_name}, {self.first_name}"
@@ -0,0 +1,164 @@
+"""Paginación por cursor (keyset) reutilizable entre apps.
+
+A diferencia de `Paginator` de Django (LIMIT/OFFSET), cada página se obtiene
+con un filtro de rango sobre las columnas de orden a partir de la última fila
+vista, por lo que navegar a páginas profundas cuesta lo mismo que la primera
+si existe un índice sobre esas columnas.
+
+Uso típico en una vista:
+
+    paginator = KeysetPaginator(qs, ordering=['-date', '-id'], page_size=20)
+    page = paginator.page_from_request(request)
+    page.object_list, page.next_query, page.previous_query
+"""
+import base64
+import json
+
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """El cursor recibido no se puede decodificar para este orden."""
+
+
+class KeysetPage:
+    """Resultado de una página: filas, cursores y querystrings para navegar."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor, page_size, params=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.page_size = page_size
+        self._params = params
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def _query(self, key, cursor):
+        params = self._params.copy() if self._params is not None else {}
+        for k in ('after', 'before'):
+            params.pop(k, None)
+        params[key] = cursor
+        if hasattr(params, 'urlencode'):
+            return params.urlencode()
+        from urllib.parse import urlencode
+        return urlencode(params)
+
+    @property
+    def next_query(self):
+        """Querystring (sin '?') para la página siguiente, o None."""
+        return self._query('after', self.next_cursor) if self.has_next else None
+
+    @property
+    def previous_query(self):
+        """Querystring (sin '?') para la página anterior, o None."""
+        return self._query('before', self.previous_cursor) if self.has_previous else None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """Paginador por cursor sobre un orden total (la última columna debe ser única, ej. 'id').
+
+    Args:
+        queryset: QuerySet a paginar (se le aplica `ordering`).
+        ordering: lista de campos con prefijo '-' opcional, ej. ['-date', '-id'].
+        page_size: filas por página.
+        max_page_size: tope para `page_size` cuando viene del request.
+    """
+
+    def __init__(self, queryset, ordering, page_size=20, max_page_size=200):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.max_page_size = max_page_size
+        self.page_size = self._clamp(page_size)
+        self._fields = [
+            (name.lstrip('-'), name.startswith('-'), queryset.model._meta.get_field(name.lstrip('-')))
+            for name in self.ordering
+        ]
+
+    def _clamp(self, size):
+        return max(1, min(int(size), self.max_page_size))
+
+    # -- cursores -------------------------------------------------------
+
+    def encode_cursor(self, obj):
+        values = []
+        for name, _desc, field in self._fields:
+            value = getattr(obj, field.attname)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        raw = json.dumps(values, default=str, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self._fields):
+                raise InvalidCursor(cursor)
+            return [field.to_python(v) for (_n, _d, field), v in zip(self._fields, values)]
+        except InvalidCursor:
+            raise
+        except Exception as e:
+            raise InvalidCursor(cursor) from e
+
+    def _seek(self, values, forward):
+        """Q para las filas estrictamente después (forward) o antes del cursor."""
+        condition = Q()
+        for i, (name, desc, _field) in enumerate(self._fields):
+            # asc + forward -> gt ; desc + forward -> lt ; backward invierte
+            op = 'gt' if desc != forward else 'lt'
+            term = Q(**{f'{name}__{op}': values[i]})
+            for j, (prev_name, _d, _f) in enumerate(self._fields[:i]):
+                term &= Q(**{prev_name: values[j]})
+            condition |= term
+        return condition
+
+    # -- páginas --------------------------------------------------------
+
+    def page(self, after=None, before=None, params=None):
+        """Obtener la página siguiente a `after` o anterior a `before` (cursores)."""
+        size = self.page_size
+        if before:
+            values = self.decode_cursor(before)
+            reverse = [name[1:] if name.startswith('-') else f'-{name}' for name in self.ordering]
+            rows = list(self.queryset.filter(self._seek(values, forward=False)).order_by(*reverse)[:size + 1])
+            if len(rows) <= size:
+                # se alcanzó el principio: mostrar una primera página completa
+                return self.page(params=params)
+            rows = rows[:size][::-1]
+            next_cursor = self.encode_cursor(rows[-1])
+            previous_cursor = self.encode_cursor(rows[0])
+        else:
+            qs = self.queryset.order_by(*self.ordering)
+            if after:
+                qs = qs.filter(self._seek(self.decode_cursor(after), forward=True))
+            rows = list(qs[:size + 1])
+            has_more = len(rows) > size
+            rows = rows[:size]
+            next_cursor = self.encode_cursor(rows[-1]) if rows and has_more else None
+            previous_cursor = self.encode_cursor(rows[0]) if rows and after else None
+        return KeysetPage(rows, next_cursor, previous_cursor, size, params=params)
+
+    def page_from_request(self, request):
+        """Leer `after`, `before` y `page_size` de request.GET (cursor inválido -> primera página)."""
+        params = request.GET
+        size = params.get('page_size')
+        if size:
+            try:
+                self.page_size = self._clamp(size)
+            except (TypeError, ValueError):
+                pass
+        try:
+            return self.page(after=params.get('after'), before=params.get('before'), params=params)
+        except InvalidCursor:
+            return self.page(params=params)
@@ -0,0 +1,239 @@
+"""Servicios de la app `core`.
+
+Usar `apps.get_model()` para referenciar modelos y evitar imports circulares.
+"""
+import hashlib
+import re
+import unicodedata
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+
+
+class UserAccessCache:
+    """Roles, grupos y permisos de un usuario, cacheados en el cache de Django.
+
+    Se resuelven con una consulta por fuente (roles, grupos, permisos directos,
+    permisos por grupo), trayendo `app_label` con un join a ContentType en vez de
+    un acceso por permiso. El resultado se guarda por usuario bajo una clave que
+    incluye un número de versión global:
+
+    - cambios que afectan a un solo usuario (sus grupos, sus permisos, sus roles,
+      el propio User) borran solo su entrada (`invalidate_user`);
+    - cambios que pueden afectar a muchos (permisos de un grupo, nombres de
+      grupos o roles) incrementan la versión global (`invalidate_all`) y todas
+      las entradas anteriores quedan huérfanas hasta expirar.
+
+    Las invalidaciones se conectan en `CoreConfig.ready`. Con el cache en memoria
+    por proceso (LocMemCache), otros workers pueden ver datos viejos hasta
+    `timeout` segundos; con un cache compartido la invalidación es inmediata.
+    """
+
+    key_prefix = 'core:user_access'
+    version_key = 'core:user_access:version'
+    timeout = 300
+
+    @classmethod
+    def _version(cls):
+        version = cache.get(cls.version_key)
+        if version is None:
+            version = 1
+            cache.add(cls.version_key, version, None)
+        return version
+
+    @classmethod
+    def _key(cls, user_id):
+        return f'{cls.key_prefix}:{cls._version()}:{user_id}'
+
+    @staticmethod
+    def _load(user):
+        Role = apps.get_model('core', 'Role')
+        Permission = apps.get_model('auth', 'Permission')
+        fields = ('content_type__app_label', 'codename')
+
+        perms = {f'{app}.{codename}' for app, codename in Permission.objects.filter(user=user).values_list(*fields)}
+        perms.update(
+            f'{app}.{codename}'
+            for app, codename in Permission.objects.filter(group__user=user).values_list(*fields).distinct()
+        )
+        # superusers have all perms
+        if user.is_superuser:
+            perms.add('__all__')
+        return {
+            'roles': list(Role.objects.filter(profile__user=user).order_by('name').values_list('name', flat=True)),
+            'groups': list(user.groups.order_by('name').values_list('name', flat=True)),
+            'perms': frozenset(perms),
+        }
+
+    @classmethod
+    def get(cls, user):
+        """Devolver {'roles', 'groups', 'perms'} del usuario, desde el cache si está."""
+        key = cls._key(user.pk)
+        access = cache.get(key)
+        if access is None:
+            access = cls._load(user)
+            cache.set(key, access, cls.timeout)
+        return access
+
+    @classmethod
+    def invalidate_user(cls, user_ids):
+        """Descartar la entrada de los usuarios dados (ahora y al confirmar la transacción)."""
+        keys = [f'{cls.key_prefix}:{cls._version()}:{pk}' for pk in user_ids]
+        if not keys:
+            return
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many([cls._key(pk) for pk in user_ids]))
+
+    @classmethod
+    def invalidate_all(cls):
+        """Invalidar las entradas de todos los usuarios incrementando la versión."""
+        cls._bump_version()
+        transaction.on_commit(cls._bump_version)
+
+    @classmethod
+    def _bump_version(cls):
+        try:
+            cache.incr(cls.version_key)
+        except ValueError:
+            # la clave no existe (cache reiniciado): cualquier valor nuevo sirve
+            cache.set(cls.version_key, cls._version() + 1, None)
+
+
+
+class CacheVersion:
+    """Números de versión por espacio de nombres para invalidar caches por grupo.
+
+    Las claves cacheadas (fragmentos de plantilla, resultados de servicios) incluyen
+    la versión actual de su espacio ('courses', 'cooperadora', ...). Una escritura
+    incrementa la versión y todas esas claves dejan de usarse de inmediato, sin
+    tener que conocerlas ni borrarlas una por una; las viejas expiran solas.
+
+    Las versiones viven en el cache por defecto: con varios workers tiene que ser
+    un cache compartido (archivo o Redis, ver CACHES en settings) para que una
+    escritura en un worker invalide también a los demás.
+    """
+
+    key_prefix = 'core:cache_version'
+
+    @classmethod
+    def get(cls, namespace):
+        key = f'{cls.key_prefix}:{namespace}'
+        version = cache.get(key)
+        if version is None:
+            version = 1
+            if not cache.add(key, version, None):
+                version = cache.get(key, version)
+        return version
+
+    @classmethod
+    def bump(cls, namespace):
+        """Incrementar la versión ahora y otra vez al confirmar la transacción.
+
+        El segundo incremento evita que una lectura concurrente previa al commit
+        deje cacheados los datos viejos con la versión nueva.
+        """
+        cls._incr(namespace)
+        transaction.on_commit(lambda: cls._incr(namespace))
+
+    @classmethod
+    def _incr(cls, namespace):
+        key = f'{cls.key_prefix}:{namespace}'
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, cls.get(namespace) + 1, None)
+
+
+class SidebarMenu:
+    """Enlaces del menú lateral (base.html) visibles para un usuario.
+
+    Se arma con los permisos y roles que ya cachea `UserAccessCache`. La clave
+    `key` resume lo que se muestra (enlaces y roles): base.html guarda el menú
+    renderizado en un fragmento de cache con esa clave, así que los usuarios con
+    los mismos permisos comparten el fragmento y un cambio de permisos o roles
+    produce otra clave, sin tener que invalidar nada.
+    """
+
+    SUPERUSER = '__superuser__'
+    # (texto, url, permiso requerido; None = visible para todos)
+    items = [
+        ('Inicio', '/', None),
+        ('Alumnos', '/students/', 'students.view_student'),
+        ('Cursos', '/courses/', 'courses.view_course'),
+        ('Asignaturas', '/subjects/', 'subjects.view_subject'),
+        ('Docentes', '/teachers/', 'teachers.view_teacher'),
+        ('Proyectos', '/projects/', 'projects.view_project'),
+        ('Cooperadora', '/cooperadora/', 'cooperadora.view_transaction'),
+        ('Admin', '/admin/', SUPERUSER),
+    ]
+
+    @classmethod
+    def for_user(cls, user, access):
+        """Devolver {'links', 'roles', 'authenticated', 'key'} para `user`."""
+        authenticated = user is not None and user.is_authenticated
+        superuser = authenticated and user.is_superuser
+        links = [
+            (label, url) for label, url, perm in cls.items
+            if perm is None or superuser or (authenticated and perm in access['perms'])
+        ]
+        roles = list(access['roles']) if authenticated else []
+        key = hashlib.md5(repr((authenticated, links, roles)).encode()).hexdigest()
+        return {'links': links, 'roles': roles, 'authenticated': authenticated, 'key': key}
+
+
+def normalize_search(text):
+    """Texto en minúsculas, sin acentos y con espacios simples ('Pérez  Ñoño' -> 'perez nono')."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.lower().split())
+
+
+def normalize_dni(text):
+    """Solo los dígitos del DNI ('20.123.456' -> '20123456')."""
+    return re.sub(r'\D', '', text or '')
+
+
+class PersonSearch:
+    """Búsqueda de personas (Student/Teacher) sobre las columnas normalizadas de Person.
+
+    - Si la consulta son solo dígitos (con o sin puntos) se busca por prefijo de DNI.
+    - Si no, en PostgreSQL cada palabra debe aparecer en `search_name`
+      ("apellido nombre" normalizado), acelerado por el índice GIN de trigramas.
+    - En otros motores (SQLite) la primera palabra es un prefijo de `search_name` o
+      de `search_name_first` ("nombre apellido"), rangos sobre sus índices B-tree,
+      así que se puede empezar por el apellido o por el nombre; el resto de las
+      palabras filtra por contenido.
+
+    Los rangos `>= prefijo` / `< prefijo + U+FFFF` usan el índice en cualquier motor,
+    a diferencia de LIKE/ILIKE.
+    """
+
+    ordering = ['search_name', 'id']
+
+    @staticmethod
+    def _prefix(field, prefix):
+        return {f'{field}__gte': prefix, f'{field}__lt': prefix + '\uffff'}
+
+    @classmethod
+    def filter(cls, queryset, query):
+        query = (query or '').strip()
+        if not query:
+            return queryset
+        digits = normalize_dni(query)
+        if digits and re.fullmatch(r'[\d.\s]+', query):
+            return queryset.filter(**cls._prefix('search_dni', digits))
+
+        words = normalize_search(query).split()
+        if not words:
+            # solo signos que la normalización descarta (p. ej. acentos sueltos)
+            return queryset
+        if connection.vendor != 'postgresql':
+            queryset = queryset.filter(
+                Q(**cls._prefix('search_name', words[0])) | Q(**cls._prefix('search_name_first', words[0]))
+            )
+            words = words[1:]
+        for word in words:
+            queryset = queryset.filter(search_name__contains=word)
+        return queryset
@@ -0,0 +1,46 @@
+"""Respuestas en streaming que funcionan bien tanto con WSGI como con ASGI.
+
+Con WSGI (gunicorn sync/gthread) una StreamingHttpResponse recorre un iterador
+común y el worker queda ocupado hasta terminar, como siempre.
+
+Con ASGI (uvicorn), Django 4.2 no puede recorrer un iterador sincrónico desde el
+event loop: lo consume entero en memoria antes de enviar el primer byte. Por eso
+`streaming_response` lo envuelve en un iterador asincrónico que pide las líneas
+de a bloques en un hilo (`sync_to_async`): el ORM sigue corriendo sincrónico, en
+el mismo hilo y con la misma conexión durante todo el request, y entre bloque y
+bloque el event loop queda libre para atender otros requests.
+"""
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+
+# Líneas generadas por cada salto al hilo sincrónico
+STREAM_CHUNK_SIZE = 500
+
+
+def _take(iterator, size):
+    chunk = []
+    for item in iterator:
+        chunk.append(item)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+async def iterate_in_thread(iterable, chunk_size=STREAM_CHUNK_SIZE):
+    """Recorrer un iterable sincrónico desde código async, de a `chunk_size` elementos."""
+    iterator = iter(iterable)
+    take = sync_to_async(_take)
+    while True:
+        chunk = await take(iterator, chunk_size)
+        if not chunk:
+            break
+        for item in chunk:
+            yield item
+
+
+def streaming_response(request, iterable, **kwargs):
+    """StreamingHttpResponse sobre `iterable`, asincrónica si el request llegó por ASGI."""
+    if isinstance(request, ASGIRequest):
+        iterable = iterate_in_thread(iterable)
+    return StreamingHttpResponse(iterable, **kwargs)
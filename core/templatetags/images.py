@@ -0,0 +1,31 @@
+from django import template
+from django.forms.utils import flatatt
+from django.templatetags.static import static
+from django.utils.html import format_html
+
+from core.images import IMAGE_VARIANTS, variant_name
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(source, sizes, **attrs):
+    """<picture> con las variantes WebP de `source` y el PNG original como respaldo.
+
+    Args:
+        source: nombre de la imagen en graphics/ (ej. 'FullLogo_Transparent.png')
+        sizes: ancho en pantalla para elegir la variante (atributo `sizes`, ej. '160px')
+        attrs: atributos del <img>; los guiones bajos pasan a guiones (aria_hidden -> aria-hidden)
+
+    Ejemplo:
+        {% picture 'Salir.png' '26px' alt='Salir' class='logout-icon' %}
+    """
+    img_attrs = flatatt({key.replace('_', '-'): value for key, value in attrs.items()})
+    widths = IMAGE_VARIANTS.get(source)
+    if not widths:
+        return format_html('<img src="{}"{}>', static(source), img_attrs)
+    srcset = ', '.join(f'{static(variant_name(source, width))} {width}w' for width in widths)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}"><img src="{}"{}></picture>',
+        srcset, sizes, static(source), img_attrs,
+    )
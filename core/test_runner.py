@@ -0,0 +1,25 @@
+"""Runner de `manage.py test` (ver TEST_RUNNER en settings)."""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """Corre los tests con el almacenamiento de estáticos simple.
+
+    Con STATICFILES_MANIFEST=True (por ejemplo, dentro de la imagen de Docker)
+    `{% static %}` necesita el staticfiles.json de collectstatic, que los tests
+    no generan.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._storages = override_settings(STORAGES={
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+        })
+        self._storages.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._storages.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,7 +1,36 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 
+from .pagination import KeysetPaginator
+from .services import PersonSearch
+
 
 @login_required
 def home(request):
     return render(request, 'core/home.html', {})
+
+
+class PersonSearchListMixin:
+    """Listado de personas (Student/Teacher) con búsqueda `?q=` y paginación por cursor.
+
+    Busca por apellido, nombre o DNI sobre las columnas normalizadas de Person
+    (ver `core.services.PersonSearch`) y pagina con `KeysetPaginator` ordenando
+    por (search_name, id), el mismo índice que usa la búsqueda.
+    """
+    page_size = 25
+    max_page_size = 200
+
+    def get_queryset(self):
+        return PersonSearch.filter(super().get_queryset(), self.request.GET.get('q'))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        paginator = KeysetPaginator(
+            self.object_list, PersonSearch.ordering,
+            page_size=self.page_size, max_page_size=self.max_page_size,
+        )
+        page = paginator.page_from_request(self.request)
+        context['page'] = page
+        context['q'] = self.request.GET.get('q', '')
+        context[self.get_context_object_name(self.object_list)] = page.object_list
+        return context
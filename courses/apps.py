@@ -4,3 +4,23 @@ from django.apps import AppConfig
 class CoursesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'courses'
+
+    def ready(self):
+        # Any write to data shown in the courses table invalidates its cached fragment
+        from django.db.models.signals import post_delete, post_save
+        for sender in CACHED_TABLE_MODELS:
+            post_save.connect(bump_courses_version, sender=sender)
+            post_delete.connect(bump_courses_version, sender=sender)
+
+
+# Models rendered in the cached courses table (names, rosters, materials)
+CACHED_TABLE_MODELS = (
+    'courses.Course', 'courses.Enrollment', 'courses.CourseMaterial',
+    'courses.Level', 'courses.Division', 'courses.Specialty',
+    'students.Student', 'teachers.Teacher', 'subjects.Subject',
+)
+
+
+def bump_courses_version(sender, **kwargs):
+    from core.services import CacheVersion
+    CacheVersion.bump('courses')
@@ -4,7 +4,14 @@ Keep business logic and orchestration here (tests can import these services).
 Use `apps.get_model()` to avoid circular imports when referencing models from other apps.
 """
 from django.apps import apps
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
+
+from core.services import CacheVersion
+
+
+def _pk(obj):
+    """Return the PK of a model instance, or the value itself if it already is a PK."""
+    return obj.pk if hasattr(obj, 'pk') else obj
 
 
 class EnrollmentService:
@@ -75,6 +82,152 @@ class EnrollmentService:
         enr.save()
         return enr
 
+    @staticmethod
+    def enroll_many(students, course, enrolled_on=None, batch_size=500):
+        """Enroll many students in `course` with a fixed number of queries.
+
+        Args:
+            students: iterable of `students.Student` instances or PKs
+            course: a `courses.Course` instance or PK
+            enrolled_on: optional date for every new enrollment
+            batch_size: rows per INSERT
+
+        Returns:
+            dict with:
+              - created: list of new Enrollment instances
+              - conflicts: list of (student_pk, reason) for students that were
+                skipped (already enrolled, not found, repeated in the input)
+
+        If another request enrolls one of the students between the existence
+        check and the insert, the batch is retried row by row (one savepoint
+        each) and only that student is reported as a conflict.
+
+        Raises:
+            Course.DoesNotExist if the course does not exist.
+        """
+        Enrollment = apps.get_model('courses', 'Enrollment')
+        Student = apps.get_model('students', 'Student')
+        Course = apps.get_model('courses', 'Course')
+
+        if not hasattr(course, 'pk'):
+            course = Course.objects.get(pk=course)
+
+        conflicts = []
+        student_ids = []
+        seen = set()
+        for student in students:
+            pk = _pk(student)
+            if pk in seen:
+                conflicts.append((pk, 'duplicated in input'))
+                continue
+            seen.add(pk)
+            student_ids.append(pk)
+
+        with transaction.atomic():
+            # one query to resolve PKs, one to detect existing enrollments
+            found = set(Student.objects.filter(pk__in=student_ids).values_list('pk', flat=True))
+            enrolled = set(
+                Enrollment.objects.filter(course=course, student_id__in=student_ids).values_list('student_id', flat=True)
+            )
+            new = []
+            for pk in student_ids:
+                if pk not in found:
+                    conflicts.append((pk, 'student not found'))
+                elif pk in enrolled:
+                    conflicts.append((pk, 'already enrolled in this course'))
+                else:
+                    new.append(Enrollment(student_id=pk, course=course, enrolled_on=enrolled_on))
+            try:
+                with transaction.atomic():
+                    created = Enrollment.objects.bulk_create(new, batch_size=batch_size)
+            except IntegrityError:
+                # concurrent enrollment: keep the rest of the batch
+                created = []
+                for enrollment in new:
+                    try:
+                        with transaction.atomic():
+                            enrollment.save(force_insert=True)
+                    except IntegrityError:
+                        enrollment.pk = None
+                        conflicts.append((enrollment.student_id, 'already enrolled in this course'))
+                    else:
+                        created.append(enrollment)
+            if created:
+                # bulk_create does not send signals: invalidate cached course pages here
+                CacheVersion.bump('courses')
+
+        return {'created': created, 'conflicts': conflicts}
+
+    @staticmethod
+    def promote_level(from_level, to_level, division_map=None, enrolled_on=None, batch_size=500):
+        """Move every enrollment of `from_level` to the matching course of `to_level`.
+
+        Each enrollment goes to the course of `to_level` with the same specialty and
+        the division given by `division_map` (same division when not mapped), e.g.
+        Primero A -> Segundo A. Enrollments are moved (not copied), as in
+        `move_enrollment`, with one `bulk_update` inside a single atomic block.
+
+        Args:
+            from_level: Level instance or PK to promote students from
+            to_level: Level instance or PK to promote students to
+            division_map: optional dict {from_division: to_division} (instances or PKs)
+            enrolled_on: optional date to set on the moved enrollments (kept otherwise)
+            batch_size: rows per UPDATE
+
+        Returns:
+            dict with:
+              - moved: number of enrollments moved
+              - conflicts: list of (student_pk, reason) for enrollments left in place
+                (no destination course, or student already enrolled there), the
+                same shape as in `enroll_many`
+        """
+        Enrollment = apps.get_model('courses', 'Enrollment')
+        Course = apps.get_model('courses', 'Course')
+
+        from_level, to_level = _pk(from_level), _pk(to_level)
+        division_map = {_pk(k): _pk(v) for k, v in (division_map or {}).items()}
+
+        with transaction.atomic():
+            targets = {
+                (division_id, specialty_id): pk
+                for pk, division_id, specialty_id in Course.objects.filter(level_id=to_level)
+                .values_list('pk', 'division_id', 'specialty_id')
+            }
+            taken = set(
+                Enrollment.objects.filter(course__level_id=to_level).values_list('student_id', 'course_id')
+            )
+            enrollments = (
+                Enrollment.objects.filter(course__level_id=from_level)
+                .select_related('course')
+                .select_for_update(of=('self',))
+                .order_by('pk')
+            )
+
+            conflicts = []
+            to_update = []
+            for enr in enrollments:
+                division = division_map.get(enr.course.division_id, enr.course.division_id)
+                target = targets.get((division, enr.course.specialty_id))
+                if target is None:
+                    conflicts.append((enr.student_id, 'no destination course'))
+                    continue
+                if (enr.student_id, target) in taken:
+                    conflicts.append((enr.student_id, 'already enrolled in destination course'))
+                    continue
+                taken.add((enr.student_id, target))
+                enr.course_id = target
+                if enrolled_on is not None:
+                    enr.enrolled_on = enrolled_on
+                to_update.append(enr)
+
+            fields = ['course', 'enrolled_on'] if enrolled_on is not None else ['course']
+            Enrollment.objects.bulk_update(to_update, fields, batch_size=batch_size)
+            if to_update:
+                # bulk_update does not send signals: invalidate cached course pages here
+                CacheVersion.bump('courses')
+
+        return {'moved': len(to_update), 'conflicts': conflicts}
+
     @staticmethod
     def list_enrollments_by_level(level):
         """Return Enrollment queryset for a Level instance or PK."""
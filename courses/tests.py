@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from core.services import UserAccessCache
+from students.models import Student
+from subjects.models import Subject
+from teachers.models import Teacher
+
+from .models import Course, CourseMaterial, Division, Enrollment, Level
+from .services import EnrollmentService
+
+# session and user, run by the middleware on every request
+REQUEST_QUERIES = 2
+# courses and its two prefetches
+INDEX_QUERIES = 3
+
+
+class CourseIndexQueriesTests(TestCase):
+    """The courses index runs a fixed number of queries (N+1 regression)."""
+
+    def setUp(self):
+        cache.clear()
+        self.level = Level.objects.create(order=1, name='Primero')
+        self.user = User.objects.create_superuser('queries', 'queries@example.com', 'queries')
+        self.client.force_login(self.user)
+
+    def seed(self, courses, students_per_course):
+        """Add courses with enrolled students and one subject each."""
+        start = Course.objects.count()
+        for i in range(start, start + courses):
+            course = Course.objects.create(level=self.level, division=Division.objects.create(name=f'D{i}'))
+            teacher = Teacher.objects.create(first_name='Docente', last_name=f'T{i}')
+            subject = Subject.objects.create(name=f'Materia {i}')
+            CourseMaterial.objects.create(course=course, subject=subject, teacher=teacher)
+            students = Student.objects.bulk_create([
+                Student(first_name=f'Alumno {j}', last_name=f'C{i}') for j in range(students_per_course)
+            ])
+            Enrollment.objects.bulk_create([Enrollment(student=s, course=course) for s in students])
+
+    def assertIndexQueries(self):
+        # cold table fragment, warm permissions: count only the course queries
+        cache.clear()
+        UserAccessCache.get(self.user)
+        with self.assertNumQueries(REQUEST_QUERIES + INDEX_QUERIES):
+            response = self.client.get(reverse('courses:index'))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_query_count_does_not_grow_with_school_size(self):
+        self.seed(2, 2)
+        self.assertIndexQueries()
+        self.seed(30, 25)
+        response = self.assertIndexQueries()
+        self.assertContains(response, 'Materia 31')
+        self.assertContains(response, 'Alumno 24 C31')
+
+    def test_cached_table_runs_no_course_queries(self):
+        self.seed(3, 2)
+        self.assertIndexQueries()
+        with self.assertNumQueries(REQUEST_QUERIES):
+            self.client.get(reverse('courses:index'))
+
+
+class EnrollManyTests(TestCase):
+    def setUp(self):
+        level = Level.objects.create(order=1, name='Primero')
+        self.course = Course.objects.create(level=level, division=Division.objects.create(name='A'))
+        self.students = Student.objects.bulk_create([
+            Student(first_name=f'Alumno {i}', last_name='E') for i in range(4)
+        ])
+
+    def test_reports_existing_missing_and_repeated_students(self):
+        first, second = self.students[:2]
+        Enrollment.objects.create(student=first, course=self.course)
+        result = EnrollmentService.enroll_many([first, second, second.pk, 999999], self.course)
+        self.assertEqual([e.student_id for e in result['created']], [second.pk])
+        self.assertEqual(result['conflicts'], [
+            (second.pk, 'duplicated in input'),
+            (first.pk, 'already enrolled in this course'),
+            (999999, 'student not found'),
+        ])
+
+    def test_concurrent_enrollment_skips_only_that_student(self):
+        racer = self.students[1]
+        real_filter = Enrollment.objects.filter
+
+        def filter_after_race(*args, **kwargs):
+            # another request enrolls `racer` right after the existence check
+            queryset = real_filter(*args, **kwargs)
+            if not real_filter(student=racer, course=self.course).exists():
+                Enrollment.objects.create(student=racer, course=self.course)
+                return queryset.none()
+            return queryset
+
+        with mock.patch.object(Enrollment.objects, 'filter', side_effect=filter_after_race):
+            result = EnrollmentService.enroll_many(self.students, self.course)
+
+        self.assertEqual(result['conflicts'], [(racer.pk, 'already enrolled in this course')])
+        self.assertEqual(len(result['created']), 3)
+        self.assertTrue(all(e.pk for e in result['created']))
+        self.assertEqual(Enrollment.objects.filter(course=self.course).count(), 4)
+
+    def test_promote_level_conflicts_use_student_pk(self):
+        Enrollment.objects.create(student=self.students[0], course=self.course)
+        second = Level.objects.create(order=2, name='Segundo')
+        result = EnrollmentService.promote_level(self.course.level, second)
+        self.assertEqual(result['conflicts'], [(self.students[0].pk, 'no destination course')])
@@ -4,26 +4,60 @@ from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.views.generic import CreateView, UpdateView, DeleteView
 from django.contrib import messages
+from django.conf import settings
+from django.db.models import Prefetch
+
+from core.services import CacheVersion, UserAccessCache
 
 from .forms import CourseForm, CourseMaterialForm, EnrollmentForm
 
+# Permissions that change which links the courses table shows
+COURSE_ACTION_PERMS = [
+    'students.add_studentattendance',
+    'courses.change_course',
+    'courses.delete_course',
+    'courses.change_coursematerial',
+    'courses.delete_coursematerial',
+    'courses.delete_enrollment',
+]
+
 
 def index(request):
     Course = apps.get_model('courses', 'Course')
     Enrollment = apps.get_model('courses', 'Enrollment')
-    qs = Course.objects.select_related('level', 'division', 'specialty').all().order_by('level__order', 'division__name')
-
-    # annotate enrollment counts in Python to avoid adding DB-specific code here
-    courses = []
-    for c in qs:
-        count = Enrollment.objects.filter(course=c).count()
-        courses.append({
-            'instance': c,
-            'enrollments': count,
-        })
+    CourseMaterial = apps.get_model('courses', 'CourseMaterial')
+
+    # Fixed number of queries regardless of school size: one for courses and one
+    # per prefetched relation, with the related student/subject/teacher joined in
+    # so rendering names fires no queries.
+    qs = (
+        Course.objects
+        .select_related('level', 'division', 'specialty')
+        .prefetch_related(
+            Prefetch(
+                'enrollment_set',
+                queryset=Enrollment.objects.select_related('student').order_by('student__last_name', 'student__first_name'),
+            ),
+            Prefetch(
+                'materials',
+                queryset=CourseMaterial.objects.select_related('subject', 'teacher').order_by('subject__name'),
+            ),
+        )
+        .order_by('level__order', 'division__name')
+    )
+
+    # The table is a template fragment cached per data version and per set of
+    # action links the user can see; the queryset stays lazy, so a cache hit
+    # runs none of the queries above.
+    user = request.user
+    perms = UserAccessCache.get(user)['perms'] if user.is_authenticated else frozenset()
+    actions = [p for p in COURSE_ACTION_PERMS if user.is_superuser or p in perms]
 
     return render(request, 'courses/index.html', {
-        'courses': courses,
+        'courses': qs,
+        'courses_version': CacheVersion.get('courses'),
+        'actions_key': ','.join(actions),
+        'cache_timeout': settings.CACHE_TIMEOUT,
     })
 
 
@@ -0,0 +1,54 @@
+"""Configuración de gunicorn (se lee sola al ejecutar `gunicorn` en la raíz del proyecto).
+
+Perfiles (variable SERVER_PROFILE):
+- `sync` (por defecto): impulsa.wsgi con workers sync, o gthread si
+  GUNICORN_THREADS > 1. Cada request ocupa un worker (o un hilo) hasta terminar.
+- `asgi`: impulsa.asgi con workers de uvicorn. Las exportaciones CSV se envían
+  de a bloques sin bloquear el worker, que sigue atendiendo otros requests.
+
+Variables:
+    GUNICORN_BIND      dirección (por defecto 0.0.0.0:8000)
+    GUNICORN_WORKERS   procesos (por defecto 2 x CPUs + 1 con cache compartido, si no 1)
+    GUNICORN_THREADS   hilos por worker en el perfil sync (por defecto 1)
+    GUNICORN_TIMEOUT   segundos antes de reiniciar un worker colgado (por defecto 60)
+
+Con más de un worker el cache tiene que ser compartido (CACHE_BACKEND=file o
+redis): con el cache en memoria cada proceso invalida solo el suyo y los demás
+mostrarían datos viejos, así que en ese caso se usa un solo worker y pedir más
+es un error.
+"""
+import multiprocessing
+import os
+
+profile = os.getenv('SERVER_PROFILE', 'sync')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+shared_cache = os.getenv('CACHE_BACKEND', 'locmem') in ('file', 'redis')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1 if shared_cache else 1))
+if workers > 1 and not shared_cache:
+    raise RuntimeError(
+        f'GUNICORN_WORKERS={workers} requiere un cache compartido entre procesos '
+        '(CACHE_BACKEND=file o redis, ver impulsa/settings.py)'
+    )
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = 30
+keepalive = 5
+# reciclar workers de vez en cuando acota el crecimiento de memoria
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = max_requests // 10
+# log de accesos a stdout; GUNICORN_ACCESSLOG vacío lo desactiva
+accesslog = os.getenv('GUNICORN_ACCESSLOG', '-') or None
+
+if profile == 'asgi':
+    wsgi_app = 'impulsa.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    # Con ASGI cada request corre el código sincrónico en su propio hilo, así que
+    # las conexiones persistentes no se reutilizan: cerrar al final del request
+    # (detrás de PgBouncer, conectar es barato).
+    os.environ.setdefault('DATABASE_CONN_MAX_AGE', '0')
+elif profile == 'sync':
+    wsgi_app = 'impulsa.wsgi:application'
+    worker_class = 'gthread' if threads > 1 else 'sync'
+else:
+    raise RuntimeError(f'SERVER_PROFILE desconocido: {profile!r} (usar sync o asgi)')
@@ -1,5 +1,8 @@
 from pathlib import Path
 import os
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -15,6 +18,8 @@ INSTALLED_APPS = [
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
+    # runserver sirve los estáticos a través de WhiteNoise, igual que en producción
+    'whitenoise.runserver_nostatic',
     'django.contrib.staticfiles',
     'core',
     'students',
@@ -26,7 +31,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Instrumentación opcional (QUERY_STATS=True): primero, para medir todo el request
+    'core.middleware.QueryStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Estáticos comprimidos y con cache de larga duración (ver STORAGES)
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -55,6 +64,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'impulsa.wsgi.application'
+ASGI_APPLICATION = 'impulsa.asgi.application'
 
 DATABASES = {
     'default': {
@@ -81,6 +91,16 @@ STATICFILES_DIRS = [
     BASE_DIR / 'graphics',
 ]
 
+# Estáticos: ver STATICFILES_MANIFEST al final (por defecto, según DEBUG)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 # Redirect unauthenticated users to the site login page by default
 LOGIN_URL = '/login/'
 
@@ -90,6 +110,71 @@ LOGIN_REDIRECT_URL = '/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache: en memoria del proceso por defecto (desarrollo, un solo worker). Con varios
+# workers usar un backend compartido para que las invalidaciones lleguen a todos:
+#   CACHE_BACKEND=file  CACHE_LOCATION=/var/tmp/impulsa_cache
+#   CACHE_BACKEND=redis CACHE_LOCATION=redis://127.0.0.1:6379/1  (requiere el paquete redis)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_TIMEOUT = int(os.getenv('CACHE_TIMEOUT', '600'))
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', 'redis://127.0.0.1:6379/1'),
+            'KEY_PREFIX': 'impulsa',
+            'TIMEOUT': CACHE_TIMEOUT,
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'impulsa_cache')),
+            'TIMEOUT': CACHE_TIMEOUT,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'impulsa',
+            'TIMEOUT': CACHE_TIMEOUT,
+        }
+    }
+
+# Alias de cache (ver CACHES) del conjunto de meses cerrados de la cooperadora y
+# segundos que dura. Con un cache por proceso (locmem) el plazo acota cuánto puede
+# tardar un worker en enterarse de un cierre hecho en otro.
+COOPERADORA_CLOSED_PERIODS_CACHE = os.getenv('COOPERADORA_CLOSED_PERIODS_CACHE') or 'default'
+COOPERADORA_CLOSED_PERIODS_TIMEOUT = int(os.getenv('COOPERADORA_CLOSED_PERIODS_TIMEOUT', '60'))
+
+# Tope de módulos semanales (presenciales + tutoría) por docente; la página de
+# carga horaria marca a quienes lo superan.
+TEACHERS_WEEKLY_MODULES_CAP = int(os.getenv('TEACHERS_WEEKLY_MODULES_CAP', '40'))
+
+# Métricas de consultas SQL por request (core.middleware.QueryStatsMiddleware):
+# header Server-Timing y log JSON en 'impulsa.query_stats'. Se loguea como WARNING
+# (con las consultas repetidas y las más lentas) al superar alguno de los umbrales.
+QUERY_STATS_ENABLED = os.getenv('QUERY_STATS', 'False') == 'True'
+QUERY_STATS_MAX_QUERIES = int(os.getenv('QUERY_STATS_MAX_QUERIES', '50'))
+QUERY_STATS_MAX_DB_MS = float(os.getenv('QUERY_STATS_MAX_DB_MS', '500'))
+QUERY_STATS_TOP = 5
+
+if QUERY_STATS_ENABLED:
+    # DEBUG = una línea por request; WARNING = solo los que superan los umbrales
+    LOGGING = {
+        'version': 1,
+        'disable_existing_loggers': False,
+        'handlers': {'console': {'class': 'logging.StreamHandler'}},
+        'loggers': {
+            'impulsa.query_stats': {
+                'handlers': ['console'],
+                'level': os.getenv('QUERY_STATS_LOG_LEVEL', 'WARNING'),
+                'propagate': False,
+            },
+        },
+    }
+
 
 import os
 
@@ -100,6 +185,7 @@ if os.getenv('DATABASE_NAME'):
     DEBUG = os.getenv('DEBUG', 'False') == 'True'
     ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '').split(',') if os.getenv('ALLOWED_HOSTS') else ALLOWED_HOSTS
 
+    conn_max_age = os.getenv('DATABASE_CONN_MAX_AGE', '60')
     DATABASES = {
         'default': {
             'ENGINE': 'django.db.backends.postgresql',
@@ -108,5 +194,58 @@ if os.getenv('DATABASE_NAME'):
             'PASSWORD': os.getenv('DATABASE_PASSWORD'),
             'HOST': os.getenv('DATABASE_HOST', 'localhost'),
             'PORT': os.getenv('DATABASE_PORT', '5432'),
+            # Conexiones persistentes: cada worker reutiliza su conexión durante
+            # CONN_MAX_AGE segundos en vez de abrir una (TCP + autenticación) por
+            # request. 0 = cerrar al final de cada request; vacío = sin límite.
+            'CONN_MAX_AGE': int(conn_max_age) if conn_max_age else None,
+            # Verificar la conexión reutilizada al empezar cada request (descarta
+            # las que cortó el servidor o un reinicio de la base)
+            'CONN_HEALTH_CHECKS': os.getenv('DATABASE_CONN_HEALTH_CHECKS', 'True') == 'True',
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DATABASE_CONNECT_TIMEOUT', '5')),
+            },
         }
     }
+
+    # Pool de conexiones opcional (DATABASE_POOLER). El único modo soportado es
+    # 'pgbouncer': DATABASE_HOST/PORT apuntan a PgBouncer en modo transaction. Los
+    # cursores del lado del servidor no sobreviven entre transacciones en ese modo,
+    # así que se desactivan: QuerySet.iterator() (exportaciones CSV de la
+    # cooperadora y de asistencia docente) trae entonces todo el resultado al
+    # cliente de una vez y la memoria del worker crece con el tamaño de la exportación.
+    DATABASE_POOLER = os.getenv('DATABASE_POOLER', '')
+    if DATABASE_POOLER == 'pgbouncer':
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+    elif DATABASE_POOLER:
+        raise ImproperlyConfigured(f'DATABASE_POOLER desconocido: {DATABASE_POOLER!r} (usar pgbouncer).')
+
+# Plantillas en modo producción (por defecto con DEBUG=False; TEMPLATE_PRODUCTION=True/False
+# lo fuerza): loader cacheado explícito, así cada plantilla se lee y compila una sola vez
+# por proceso, y sin el modo debug de plantillas, que guarda la posición de cada token
+# para las páginas de error. Va al final porque DEBUG puede cambiar en el bloque anterior.
+TEMPLATE_PRODUCTION = os.getenv('TEMPLATE_PRODUCTION', str(not DEBUG)) == 'True'
+if TEMPLATE_PRODUCTION:
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['debug'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+
+# Segundos que se guarda en cache el menú lateral ya renderizado (ver core.services.SidebarMenu)
+SIDEBAR_MENU_CACHE_TIMEOUT = int(os.getenv('SIDEBAR_MENU_CACHE_TIMEOUT', '3600'))
+
+# En producción (STATICFILES_MANIFEST, por defecto cuando DEBUG=False) collectstatic
+# agrega el hash del contenido a cada nombre (site.3f2a....css) y genera versiones
+# .gz y .br. WhiteNoise (y nginx, ver nginx/nginx.conf) sirven los archivos con hash
+# con Cache-Control immutable de un año: un cambio produce un nombre nuevo, así que
+# nunca hace falta invalidar el cache del navegador. Un estático que no figura en
+# staticfiles.json lanza ValueError: hay que correr collectstatic en cada deploy.
+# Los tests usan el almacenamiento simple (ver core.test_runner).
+STATICFILES_MANIFEST = os.getenv('STATICFILES_MANIFEST', str(not DEBUG)) == 'True'
+if STATICFILES_MANIFEST:
+    STORAGES['staticfiles']['BACKEND'] = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+
+TEST_RUNNER = 'core.test_runner.TestRunner'
@@ -0,0 +1,156 @@
+"""Benchmark de conexiones a la base: requests/seg con y sin conexiones persistentes.
+
+Pensado para el modo PostgreSQL (DATABASE_NAME=... y demás variables, ver
+settings): crea la base de prueba (nunca la base real), carga una escuela chica
+con `scripts.benchmark.synthetic` y llama a la aplicación WSGI real desde
+`--workers` hilos durante `--seconds` segundos por modo, como lo harían los
+workers sync de gunicorn (un hilo = un worker = una conexión). A diferencia del
+cliente de pruebas de Django, así corren las señales request_started/finished
+que cierran o reutilizan la conexión según CONN_MAX_AGE.
+
+Modos:
+- `sin reutilizar`: CONN_MAX_AGE=0, una conexión nueva por request (antes);
+- `persistente`: CONN_MAX_AGE=60 con health checks (después).
+
+Si DATABASE_POOLER=pgbouncer, las conexiones van a PgBouncer y el costo de
+conectar baja en ambos modos. Con SQLite corre igual, pero la base de prueba
+está en memoria y Django nunca cierra esas conexiones: ambos modos dan lo mismo.
+
+Uso:
+    DATABASE_NAME=impulsa_db DATABASE_USER=... python scripts/bench_db_connections.py --workers 4 --seconds 10
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impulsa.settings')
+
+import django
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client, RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from scripts.benchmark.scenarios import percentile
+from scripts.benchmark.synthetic import SchoolGenerator
+
+MODES = [
+    ('sin reutilizar', {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False}),
+    ('persistente', {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True}),
+]
+
+
+def run_mode(app, path, cookie, workers, seconds):
+    """Llamar a `app` desde `workers` hilos durante `seconds`; devolver métricas."""
+    factory = RequestFactory()
+    latencies = []
+    errors = []
+    opened = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def on_connect(sender, connection, **kwargs):
+        with lock:
+            opened.append(connection.alias)
+
+    def worker():
+        local = []
+        statuses = {}
+
+        def start_response(status, headers, exc_info=None):
+            statuses['last'] = status
+
+        while time.perf_counter() < deadline:
+            environ = factory.get(path, HTTP_COOKIE=cookie).environ
+            start = time.perf_counter()
+            response = app(environ, start_response)
+            try:
+                for _chunk in response:
+                    pass
+            finally:
+                # dispara request_finished: cierra o conserva la conexión según CONN_MAX_AGE
+                response.close()
+            local.append((time.perf_counter() - start) * 1000)
+            if not statuses['last'].startswith('200'):
+                errors.append(statuses['last'])
+        connections.close_all()
+        with lock:
+            latencies.extend(local)
+
+    connection_created.connect(on_connect)
+    try:
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        t0 = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - t0
+    finally:
+        connection_created.disconnect(on_connect)
+
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'connections': len(opened),
+        'errors': len(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='hilos concurrentes (como workers sync)')
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--path', default=None, help='URL a pedir (por defecto, el índice de cursos)')
+    parser.add_argument('--keepdb', action='store_true', help='reutilizar la base de prueba si ya existe')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        if not User.objects.filter(username='bench').exists():
+            SchoolGenerator(students=200, courses=8, attendance_days=5, ledger_years=1).generate()
+            User.objects.create_superuser('bench', 'bench@example.com', 'bench')
+        client = Client()
+        client.force_login(User.objects.get(username='bench'))
+        cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+        path = args.path or reverse('courses:index')
+        # las conexiones abiertas por la preparación no cuentan para ningún modo
+        connections.close_all()
+
+        db = connections.settings['default']
+        print(f'Motor: {connection.vendor}, pooler: {getattr(settings, "DATABASE_POOLER", "") or "ninguno"}, '
+              f'{args.workers} workers x {args.seconds:g}s sobre {path}\n')
+        print(f'{"modo":<16}{"requests":>10}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"conexiones":>12}{"errores":>10}')
+        app = get_wsgi_application()
+        original = {key: db.get(key) for key in ('CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+        try:
+            for name, overrides in MODES:
+                # cada hilo crea su conexión a partir de este diccionario
+                db.update(overrides)
+                row = run_mode(app, path, cookie, args.workers, args.seconds)
+                print(f'{name:<16}{row["requests"]:>10}{row["rps"]:>10.1f}{row["p50"]:>10.1f}'
+                      f'{row["p95"]:>10.1f}{row["connections"]:>12}{row["errors"]:>10}')
+        finally:
+            db.update(original)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
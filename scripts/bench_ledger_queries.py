@@ -0,0 +1,152 @@
+"""Benchmark de consultas del libro de cooperadora (planes de ejecución antes/después).
+
+Crea una base de prueba aparte (la misma que usa `manage.py test`, nunca la base
+real), la llena con un libro sintético y muestra, para las consultas calientes,
+el plan de ejecución y el tiempo:
+
+- sin los índices compuestos y con el filtro por `date__year`/`date__month` (antes)
+- con los índices `(date, type)` / `(date, id)` y el filtro por rango (después)
+
+Funciona con SQLite (EXPLAIN QUERY PLAN) y PostgreSQL (EXPLAIN ANALYZE).
+
+Uso:
+    python scripts/bench_ledger_queries.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impulsa.settings')
+
+import django
+django.setup()
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+from cooperadora.models import Transaction
+from cooperadora.services import LedgerTotals, month_bounds
+
+
+def seed(rows, years, batch_size=10000):
+    """Cargar `rows` transacciones repartidas en los últimos `years` años."""
+    start = date(date.today().year - years + 1, 1, 1)
+    span = (date.today() - start).days
+    types = [Transaction.INCOME, Transaction.EXPENSE, Transaction.ADJUSTMENT]
+    rnd = random.Random(42)
+    t0 = time.perf_counter()
+    batch = []
+    for i in range(rows):
+        batch.append(Transaction(
+            date=start + timedelta(days=rnd.randint(0, span)),
+            type=rnd.choices(types, weights=[60, 38, 2])[0],
+            amount=Decimal(rnd.randint(-5000, 500000)) / 100,
+            description='',
+        ))
+        if len(batch) >= batch_size:
+            Transaction.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Transaction.objects.bulk_create(batch)
+    print(f'Cargadas {rows} filas en {time.perf_counter() - t0:.1f}s')
+
+
+def explain(sql):
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN ANALYZE '
+    with connection.cursor() as cur:
+        cur.execute(prefix + sql)
+        return '\n'.join('    ' + ' '.join(str(c) for c in row) for row in cur.fetchall())
+
+
+def run(label, fn, repeat=5):
+    """Ejecutar `fn` varias veces; mostrar el plan de la última consulta y el mejor tiempo."""
+    best = None
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as ctx:
+            t0 = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    sql = ctx.captured_queries[-1]['sql']
+    print(f'\n[{label}] mejor de {repeat}: {best * 1000:.1f} ms')
+    print(explain(sql))
+
+
+def scenarios(year, month, legacy):
+    start, end = month_bounds(year, month)
+    date_from, date_to = start - timedelta(days=90), end
+
+    if legacy:
+        def month_totals():
+            LedgerTotals.compute(Transaction.objects.filter(date__year=year, date__month=month))
+    else:
+        def month_totals():
+            LedgerTotals.for_period(year, month)
+
+    def range_by_type():
+        list(Transaction.objects.filter(date__gte=date_from, date__lte=date_to, type=Transaction.EXPENSE)
+             .order_by('date').values_list('id', 'amount')[:500])
+
+    def keyset_page():
+        list(Transaction.objects.filter(date__lt=start).order_by('-date', '-id')[:50])
+
+    return [
+        ('totales del mes', month_totals),
+        ('rango + tipo', range_by_type),
+        ('página por cursor', keyset_page),
+    ]
+
+
+def drop_indexes():
+    with connection.schema_editor() as editor:
+        for index in Transaction._meta.indexes:
+            editor.remove_index(Transaction, index)
+
+
+def add_indexes():
+    with connection.schema_editor() as editor:
+        for index in Transaction._meta.indexes:
+            editor.add_index(Transaction, index)
+    with connection.cursor() as cur:
+        cur.execute('ANALYZE')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--years', type=int, default=10)
+    parser.add_argument('--keepdb', action='store_true', help='reutilizar la base de prueba si ya existe')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        if not Transaction.objects.exists():
+            seed(args.rows, args.years)
+        year, month = date.today().year - 1, 6
+        print(f'Motor: {connection.vendor}, filas: {Transaction.objects.count()}')
+
+        print('\n=== ANTES: sin índices compuestos, filtro por año/mes ===')
+        drop_indexes()
+        for label, fn in scenarios(year, month, legacy=True):
+            run(label, fn)
+
+        print('\n=== DESPUÉS: índices (date, type) / (date, id), filtro por rango ===')
+        add_indexes()
+        for label, fn in scenarios(year, month, legacy=False):
+            run(label, fn)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
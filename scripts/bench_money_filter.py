@@ -0,0 +1,126 @@
+"""Micro-benchmark del filtro `money`: renderiza una tabla de reporte de 50k filas.
+
+Compara tres variantes sobre los mismos datos:
+- legacy: la implementación anterior (float + tabla de símbolos por llamada + 3 replace)
+- money (frío): el filtro actual con la cache LRU vacía en cada corrida
+- money: el filtro actual con la cache ya cargada (renders siguientes del worker)
+
+Uso:
+    python scripts/bench_money_filter.py --rows 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impulsa.settings')
+
+import django
+django.setup()
+
+from django import template
+from django.template import Context, Engine
+
+from cooperadora.templatetags import money_filters
+from cooperadora.templatetags.money_filters import money
+
+legacy_library = template.Library()
+
+
+@legacy_library.filter(name='money')
+def legacy_money(value, currency='ARS'):
+    """Copia de la implementación anterior, solo para comparar."""
+    try:
+        val = float(value)
+    except Exception:
+        return value
+    symbols = {
+        'ARS': '$',
+        'USD': 'US$'
+    }
+    symbol = symbols.get(str(currency).upper(), str(currency))
+    negative = val < 0
+    val = abs(val)
+    s = f"{val:,.2f}"
+    s = s.replace(',', 'X').replace('.', ',').replace('X', '.')
+    if negative:
+        return f"-{symbol}{s}"
+    return f"{symbol}{s}"
+
+
+current_library = template.Library()
+current_library.filter('money', money)
+
+TABLE_FILTER = """{% load money_filters %}<table>{% for r in rows %}<tr><td>{{ r.date }}</td>
+<td>{% if r.income %}{{ r.income|money }}{% endif %}</td>
+<td>{% if r.expense %}{{ r.expense|money }}{% endif %}</td></tr>{% endfor %}</table>"""
+
+
+def engine_with(library):
+    """Engine aislado donde `{% load money_filters %}` carga `library`."""
+    engine = Engine()
+    engine.template_libraries['money_filters'] = library
+    return engine
+
+
+def make_rows(n):
+    rnd = random.Random(7)
+    # Importes "reales": muchos valores repetidos (cuotas, montos redondos)
+    amounts = [Decimal(rnd.choice([500, 1000, 1500, 2500, 5000])) for _ in range(n // 2)]
+    amounts += [Decimal(rnd.randint(1, 10000000)) / 100 for _ in range(n - n // 2)]
+    rnd.shuffle(amounts)
+    rows = []
+    for i, amt in enumerate(amounts):
+        if i % 3:
+            rows.append({'date': '2025-01-01', 'income': amt, 'expense': None})
+        else:
+            rows.append({'date': '2025-01-01', 'income': None, 'expense': -amt})
+    return rows
+
+
+def timed(label, fn, repeat, cold=False):
+    best = None
+    for _ in range(repeat):
+        if cold:
+            money_filters._format_cached.cache_clear()
+        t0 = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    print(f'{label:<14} {best * 1000:8.1f} ms')
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    legacy_tpl = engine_with(legacy_library).from_string(TABLE_FILTER)
+    current_tpl = engine_with(current_library).from_string(TABLE_FILTER)
+
+    values = [r['income'] if r['income'] is not None else r['expense'] for r in rows]
+    print(f'Solo formateo de {len(values)} importes (mejor de {args.repeat}):')
+    timed('legacy', lambda: [legacy_money(v) for v in values], args.repeat)
+    timed('money (frío)', lambda: [money(v) for v in values], args.repeat, cold=True)
+    timed('money', lambda: [money(v) for v in values], args.repeat)
+
+    print(f'\nRenderizando {args.rows} filas (mejor de {args.repeat}):')
+    a = timed('legacy', lambda: legacy_tpl.render(Context({'rows': rows})), args.repeat)
+    b = timed('money (frío)', lambda: current_tpl.render(Context({'rows': rows})), args.repeat, cold=True)
+    timed('money', lambda: current_tpl.render(Context({'rows': rows})), args.repeat)
+    info = money_filters._format_cached.cache_info()
+    print(f'cache LRU: {info.currsize}/{info.maxsize} entradas, {info.hits} aciertos, {info.misses} fallos')
+    print('salida idéntica:', a == b)
+
+
+if __name__ == '__main__':
+    main()
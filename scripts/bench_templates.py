@@ -0,0 +1,122 @@
+"""Benchmark de render de páginas que extienden base.html.
+
+Crea una base de prueba aparte (nunca la base real) con un usuario y mide, para
+cada plantilla, el tiempo por render (obtener la plantilla + renderizarla con
+los context processors, como hace `render()` en una vista) en tres modos:
+
+- `sin cache`: loaders sin cachear y modo debug de plantillas: cada render
+  vuelve a leer y compilar base.html y la plantilla hija, y el menú lateral se
+  arma cada vez (antes);
+- `loader cacheado`: loader cacheado y debug desactivado (TEMPLATE_PRODUCTION),
+  pero borrando el fragmento del menú antes de cada render;
+- `cacheado`: loader cacheado y fragmento del menú en cache (después).
+
+Los permisos del usuario quedan en el cache (UserAccessCache) en los tres modos.
+
+Uso:
+    python scripts/bench_templates.py --iterations 500
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impulsa.settings')
+
+import django
+django.setup()
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import connection
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from core.services import SidebarMenu, UserAccessCache
+from scripts.benchmark.scenarios import percentile
+
+# plantillas que extienden base.html y renderizan con un contexto vacío
+PAGES = ['core/home.html', 'students/index.html', 'teachers/index.html', 'projects/index.html']
+
+LOADERS = ['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader']
+
+
+def engine(cached):
+    options = dict(settings.TEMPLATES[0]['OPTIONS'])
+    options['debug'] = not cached
+    options['loaders'] = [('django.template.loaders.cached.Loader', LOADERS)] if cached else LOADERS
+    return DjangoTemplates({
+        'NAME': 'bench-cached' if cached else 'bench-uncached',
+        'DIRS': settings.TEMPLATES[0]['DIRS'],
+        'APP_DIRS': False,
+        'OPTIONS': options,
+    })
+
+
+def make_request(user):
+    request = RequestFactory().get('/')
+    request.user = user
+    request.session = {}
+    request._messages = FallbackStorage(request)
+    return request
+
+
+def menu_fragment_key(user):
+    access = UserAccessCache.get(user) if user.is_authenticated else {'roles': [], 'perms': frozenset()}
+    return make_template_fragment_key('sidebar', [SidebarMenu.for_user(user, access)['key']])
+
+
+def measure(backend, page, user, iterations, cold_menu):
+    request = make_request(user)
+    backend.get_template(page).render({}, request)  # calentar
+    fragment_key = menu_fragment_key(user)
+    timings = []
+    for _ in range(iterations):
+        if cold_menu:
+            cache.delete(fragment_key)
+        start = time.perf_counter()
+        backend.get_template(page).render({}, request)
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentile(timings, 50), percentile(timings, 95)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--anonymous', action='store_true', help='renderizar como usuario anónimo')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        user = AnonymousUser() if args.anonymous else User.objects.create_superuser(
+            'bench', 'bench@example.com', 'bench',
+        )
+        modes = [
+            ('sin cache', engine(cached=False), True),
+            ('loader cacheado', engine(cached=True), True),
+            ('cacheado', engine(cached=True), False),
+        ]
+        print(f'{args.iterations} renders por plantilla y modo (ms por render)\n')
+        print(f'{"plantilla":<24}' + ''.join(f'{name + " p50":>22}{"p95":>8}' for name, _b, _c in modes))
+        for page in PAGES:
+            row = f'{page:<24}'
+            for _name, backend, cold_menu in modes:
+                p50, p95 = measure(backend, page, user, args.iterations, cold_menu)
+                row += f'{p50:>22.3f}{p95:>8.3f}'
+            print(row)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,14 @@
+"""Benchmark reproducible de las páginas principales con una escuela sintética.
+
+- `synthetic`: genera en bloque (bulk_create) una escuela configurable: alumnos,
+  docentes, materias, cursos, matrículas, días de asistencia y años de libro.
+- `scenarios`: escenarios cronometrados contra las vistas reales a través del
+  cliente de pruebas de Django (índice de cursos, listado y reporte del libro,
+  exportaciones CSV, cierre de mes).
+- `__main__`: ejecuta todo sobre una base de prueba aparte (nunca la base real),
+  guarda los resultados en JSON y los compara contra una corrida anterior.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark --students 2000 --save baseline.json
+    python -m scripts.benchmark --students 2000 --compare baseline.json
+"""
@@ -0,0 +1,157 @@
+"""Generar una escuela sintética, medir las páginas principales y comparar corridas.
+
+Crea una base de prueba aparte (la misma que usa `manage.py test`, nunca la base
+real), la llena con `synthetic.SchoolGenerator`, corre los escenarios de
+`scenarios.build` con un superusuario y muestra una tabla con consultas, p50/p95,
+memoria pico y tamaño de cada respuesta.
+
+- `--save ARCHIVO` guarda los resultados (y la especificación de los datos) en JSON.
+- `--compare ARCHIVO` los compara contra una corrida guardada y termina con
+  código 1 si algún escenario hace más consultas o su p95 empeora más que
+  `--tolerance` (por defecto 25%).
+
+Con `--keepdb` sobre una base persistente (PostgreSQL) los datos se generan una
+sola vez; tener en cuenta que `month_close` cierra meses en cada corrida.
+
+Uso (desde la raíz del proyecto):
+    python -m scripts.benchmark --save baseline.json
+    python -m scripts.benchmark --compare baseline.json
+    python -m scripts.benchmark --students 5000 --ledger-years 10 --keepdb --only courses_index
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'impulsa.settings')
+
+import django
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from scripts.benchmark import scenarios
+from scripts.benchmark.synthetic import DEFAULTS, SchoolGenerator, default_until
+
+COLUMNS = ('queries', 'p50_ms', 'p95_ms', 'peak_kb', 'bytes', 'status')
+
+
+def print_table(results, baseline=None):
+    header = f'{"escenario":<24}' + ''.join(f'{col:>12}' for col in COLUMNS)
+    print(header)
+    print('-' * len(header))
+    for name, row in results.items():
+        print(f'{name:<24}' + ''.join(f'{row[col]:>12}' for col in COLUMNS))
+        old = (baseline or {}).get(name)
+        if old:
+            deltas = []
+            for col in ('queries', 'p50_ms', 'p95_ms', 'peak_kb'):
+                if old[col]:
+                    deltas.append(f'{(row[col] - old[col]) / old[col] * 100:>+11.0f}%')
+                else:
+                    deltas.append(f'{row[col] - old[col]:>+12}')
+            print(f'{"  vs. base":<24}' + ''.join(deltas))
+
+
+def regressions(results, baseline, tolerance):
+    """Escenarios que empeoraron respecto de `baseline`: lista de mensajes."""
+    found = []
+    for name, row in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        if row['queries'] > old['queries']:
+            found.append(f'{name}: {old["queries"]} -> {row["queries"]} consultas')
+        if old['p95_ms'] and row['p95_ms'] > old['p95_ms'] * (1 + tolerance):
+            found.append(f'{name}: p95 {old["p95_ms"]} -> {row["p95_ms"]} ms')
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    for key, value in DEFAULTS.items():
+        parser.add_argument('--' + key.replace('_', '-'), type=int, default=value)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--warm-cache', action='store_true', help='no vaciar el cache entre pedidos')
+    parser.add_argument('--only', action='append', help='correr solo este escenario (repetible)')
+    parser.add_argument('--save', metavar='ARCHIVO', help='guardar los resultados en JSON')
+    parser.add_argument('--compare', metavar='ARCHIVO', help='comparar contra resultados guardados')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='empeoramiento admitido del p95 (0.25 = 25%%)')
+    parser.add_argument('--keepdb', action='store_true', help='reutilizar la base de prueba si ya tiene datos')
+    args = parser.parse_args()
+
+    spec = {key: getattr(args, key) for key in DEFAULTS}
+    until = default_until()
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as fh:
+            baseline = json.load(fh)
+        if baseline['meta']['data'] != spec or baseline['meta']['until'] != until.isoformat():
+            print('AVISO: la base de comparación se generó con otros datos; las diferencias no son comparables.')
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, keepdb=args.keepdb)
+    try:
+        if not User.objects.filter(username='bench').exists():
+            t0 = time.perf_counter()
+            counts = SchoolGenerator(until=until, **spec).generate()
+            print(f'Datos generados en {time.perf_counter() - t0:.1f}s:')
+            for label, count in counts.items():
+                print(f'  {label:<32}{count:>10}')
+            User.objects.create_superuser('bench', 'bench@example.com', 'bench')
+        client = Client()
+        client.force_login(User.objects.get(username='bench'))
+
+        print(f'\nMotor: {connection.vendor}, {args.iterations} repeticiones, '
+              f'cache {"caliente" if args.warm_cache else "vacío"}\n')
+        results = {}
+        for name, request in scenarios.build(until):
+            if args.only and name not in args.only:
+                continue
+            results[name] = scenarios.measure(
+                client, request, iterations=args.iterations, warmup=args.warmup, cold_cache=not args.warm_cache,
+            )
+        print_table(results, baseline['scenarios'] if baseline else None)
+
+        if args.save:
+            with open(args.save, 'w', encoding='utf-8') as fh:
+                json.dump({
+                    'meta': {
+                        'data': spec,
+                        'until': until.isoformat(),
+                        'vendor': connection.vendor,
+                        'django': django.get_version(),
+                        'python': platform.python_version(),
+                        'iterations': args.iterations,
+                        'warm_cache': args.warm_cache,
+                        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    },
+                    'scenarios': results,
+                }, fh, indent=2, ensure_ascii=False)
+            print(f'\nResultados guardados en {args.save}')
+
+        if baseline:
+            found = regressions(results, baseline['scenarios'], args.tolerance)
+            if found:
+                print('\nREGRESIONES:')
+                for message in found:
+                    print('  ' + message)
+                sys.exit(1)
+            print('\nSin regresiones respecto de la base.')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=args.keepdb)
+        teardown_test_environment()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Escenarios cronometrados contra las vistas reales (cliente de pruebas de Django).
+
+Cada escenario es una función `request(client)` que hace un pedido y devuelve la
+respuesta. `measure` la repite y registra por escenario:
+
+- `queries`: consultas SQL del último pedido (deberían ser constantes);
+- `p50_ms`, `p95_ms`, `mean_ms`: latencia del pedido completo, incluido el
+  consumo del cuerpo de las respuestas en streaming;
+- `peak_kb`: memoria máxima asignada durante un pedido extra medido con
+  tracemalloc (aparte, porque tracemalloc hace más lentos los pedidos);
+- `bytes` y `status` de la respuesta.
+"""
+import time
+import tracemalloc
+from datetime import timedelta
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .synthetic import school_days
+
+
+def percentile(values, pct):
+    """Percentil por rango más cercano sobre `values` (no vacío)."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def _consume(response):
+    """Leer el cuerpo completo (las respuestas en streaming se generan al iterarlas)."""
+    if response.streaming:
+        return len(b''.join(response.streaming_content))
+    return len(response.content)
+
+
+def build(until):
+    """Escenarios sobre los datos generados hasta `until`: lista de (nombre, request)."""
+    Course = apps.get_model('courses', 'Course')
+    MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+    report_range = {'desde': (until - timedelta(days=365)).isoformat(), 'hasta': until.isoformat()}
+    month = f'{until.year:04d}-{until.month:02d}'
+    course_id = Course.objects.order_by('pk').values_list('pk', flat=True).first()
+    attendance_date = school_days(until, 1)[0].isoformat()
+
+    def close_oldest_open_month(client):
+        # cada repetición cierra el mes abierto más antiguo (el cierre no es repetible)
+        period = MonthPeriod.objects.filter(is_closed=False).order_by('year', 'month').first()
+        if period is None:
+            raise RuntimeError('No quedan meses abiertos para cerrar: generar más años de libro.')
+        return client.post(reverse('cooperadora:close_month', args=[period.year, period.month]))
+
+    return [
+        ('courses_index', lambda client: client.get(reverse('courses:index'))),
+        ('transaction_list', lambda client: client.get(reverse('cooperadora:transaction_list'))),
+        ('transaction_report', lambda client: client.get(reverse('cooperadora:transaction_report'), report_range)),
+        ('transaction_report_csv', lambda client: client.get(
+            reverse('cooperadora:transaction_report'), {**report_range, 'format': 'csv'})),
+        ('attendance_sheet', lambda client: client.get(
+            reverse('students:attendance', args=[course_id]), {'date': attendance_date})),
+        ('teacher_attendance_csv', lambda client: client.get(reverse('teachers:attendance_export'), {'month': month})),
+        ('month_close', close_oldest_open_month),
+    ]
+
+
+def measure(client, request, iterations=20, warmup=2, cold_cache=True):
+    """Ejecutar un escenario y devolver sus métricas (ver docstring del módulo).
+
+    Con `cold_cache` se vacía el cache antes de cada pedido: se mide el trabajo
+    real de la vista y no el fragmento cacheado.
+    """
+    def once():
+        if cold_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            response = request(client)
+            size = _consume(response)
+            elapsed = time.perf_counter() - start
+        return response, size, elapsed, len(ctx.captured_queries)
+
+    for _ in range(warmup):
+        once()
+    timings = []
+    for _ in range(iterations):
+        response, size, elapsed, queries = once()
+        timings.append(elapsed * 1000)
+
+    tracemalloc.start()
+    try:
+        once()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'status': response.status_code,
+        'queries': queries,
+        'bytes': size,
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
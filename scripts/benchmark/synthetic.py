@@ -0,0 +1,230 @@
+"""Generación de una escuela sintética en bloque.
+
+Todo se inserta con `bulk_create` por lotes, así que una escuela de miles de
+alumnos con un ciclo de asistencia y varios años de libro se genera en segundos.
+Los datos dependen solo de la especificación y de la semilla: la misma
+especificación produce siempre la misma base, para que las corridas sean
+comparables.
+
+`bulk_create` no llama a `save()` ni dispara señales, por eso acá se completan a
+mano las columnas que normalmente calcula el modelo (`search_name`,
+`search_name_first` y `search_dni` de Person, `name` de Course) y al final se
+regeneran los resúmenes mensuales de asistencia.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.apps import apps
+from django.core.cache import cache
+
+from core.services import normalize_dni, normalize_search
+from students.services import AttendanceRollup
+
+LEVEL_NAMES = ['Primero', 'Segundo', 'Tercero', 'Cuarto', 'Quinto', 'Sexto']
+FIRST_NAMES = ['Ana', 'Bruno', 'Carla', 'Diego', 'Elena', 'Facundo', 'Gisela', 'Hernán',
+               'Inés', 'Julián', 'Lucía', 'Martín', 'Noelia', 'Óscar', 'Paula', 'Ramiro']
+LAST_NAMES = ['Acosta', 'Benítez', 'Castro', 'Domínguez', 'Fernández', 'Gómez', 'Herrera',
+              'Juárez', 'López', 'Martínez', 'Núñez', 'Pérez', 'Romero', 'Sosa', 'Torres', 'Vega']
+
+# Especificación por defecto: una escuela secundaria mediana
+DEFAULTS = {
+    'students': 600,
+    'teachers': 40,
+    'subjects': 24,
+    'courses': 18,
+    'subjects_per_course': 8,
+    'attendance_days': 60,
+    'ledger_years': 3,
+    'transactions_per_day': 8,
+    'seed': 42,
+}
+
+
+def default_until():
+    """Último día del mes anterior: los datos terminan en un mes completo."""
+    return date.today().replace(day=1) - timedelta(days=1)
+
+
+def school_days(until, count):
+    """Los últimos `count` días hábiles (lunes a viernes) hasta `until`, en orden."""
+    days = []
+    current = until
+    while len(days) < count:
+        if current.weekday() < 5:
+            days.append(current)
+        current -= timedelta(days=1)
+    return days[::-1]
+
+
+def ledger_months(until, years):
+    """Meses (año, mes) del libro: `years` años terminando en el mes de `until`."""
+    months = []
+    year, month = until.year, until.month
+    for _ in range(years * 12):
+        months.append((year, month))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return months[::-1]
+
+
+def _person(model, rnd, index):
+    first = rnd.choice(FIRST_NAMES)
+    last = f'{rnd.choice(LAST_NAMES)} {index:05d}'
+    dni = str(20000000 + index * 7 + rnd.randint(0, 6))
+    return model(
+        first_name=first, last_name=last, dni=dni,
+        search_name=normalize_search(f'{last} {first}'), search_name_first=normalize_search(f'{first} {last}'),
+        search_dni=normalize_dni(dni),
+    )
+
+
+class SchoolGenerator:
+    """Generar una escuela sintética según `spec` (ver DEFAULTS).
+
+    `generate()` devuelve un diccionario con la cantidad de filas creadas por modelo.
+    """
+
+    def __init__(self, until=None, batch_size=5000, **spec):
+        unknown = set(spec) - set(DEFAULTS)
+        if unknown:
+            raise ValueError(f'Parámetros desconocidos: {", ".join(sorted(unknown))}')
+        self.spec = {**DEFAULTS, **spec}
+        self.until = until or default_until()
+        self.batch_size = batch_size
+        self.rnd = random.Random(self.spec['seed'])
+        self.counts = {}
+
+    def _bulk(self, model, objs):
+        created = model.objects.bulk_create(objs, batch_size=self.batch_size)
+        label = model._meta.label
+        self.counts[label] = self.counts.get(label, 0) + len(objs)
+        return created
+
+    def generate(self):
+        teachers = self.teachers()
+        subjects = self.subjects()
+        courses = self.courses()
+        self.materials(courses, subjects, teachers)
+        students = self.students()
+        self.enrollments(students, courses)
+        days = school_days(self.until, self.spec['attendance_days'])
+        self.student_attendance(students, days)
+        self.teacher_attendance(teachers, days)
+        self.ledger()
+        # los fragmentos y totales cacheados no vieron estas altas (sin señales)
+        cache.clear()
+        return self.counts
+
+    def teachers(self):
+        Teacher = apps.get_model('teachers', 'Teacher')
+        return self._bulk(Teacher, [_person(Teacher, self.rnd, i) for i in range(self.spec['teachers'])])
+
+    def subjects(self):
+        Subject = apps.get_model('subjects', 'Subject')
+        grades = [code for code, _label in Subject.GRADE_CHOICES]
+        return self._bulk(Subject, [
+            Subject(
+                name=f'Materia {i:03d}',
+                weekly_hours_presential=self.rnd.randint(2, 6),
+                weekly_hours_tutoring=self.rnd.choice([None, 1, 2]),
+                grade=grades[i % len(grades)],
+            )
+            for i in range(self.spec['subjects'])
+        ])
+
+    def courses(self):
+        """Cursos repartidos en niveles; las divisiones (A, B, ...) se crean según haga falta."""
+        Level = apps.get_model('courses', 'Level')
+        Division = apps.get_model('courses', 'Division')
+        Course = apps.get_model('courses', 'Course')
+        total = self.spec['courses']
+        levels = self._bulk(Level, [Level(name=name, order=i + 1) for i, name in enumerate(LEVEL_NAMES)])
+        per_level = -(-total // len(levels))
+        divisions = self._bulk(Division, [Division(name=_division_name(i)) for i in range(per_level)])
+        objs = []
+        for i in range(total):
+            level, division = levels[i % len(levels)], divisions[i // len(levels)]
+            objs.append(Course(level=level, division=division, name=f'{level.name} {division.name}'))
+        return self._bulk(Course, objs)
+
+    def materials(self, courses, subjects, teachers):
+        CourseMaterial = apps.get_model('courses', 'CourseMaterial')
+        per_course = min(self.spec['subjects_per_course'], len(subjects))
+        objs = []
+        for course in courses:
+            for subject in self.rnd.sample(subjects, per_course):
+                objs.append(CourseMaterial(course=course, subject=subject, teacher=self.rnd.choice(teachers)))
+        return self._bulk(CourseMaterial, objs)
+
+    def students(self):
+        Student = apps.get_model('students', 'Student')
+        enrolled = self.until - timedelta(days=365)
+        objs = []
+        for i in range(self.spec['students']):
+            student = _person(Student, self.rnd, i)
+            student.enrollment_date = enrolled
+            objs.append(student)
+        return self._bulk(Student, objs)
+
+    def enrollments(self, students, courses):
+        """Cada alumno en un curso, repartidos en partes iguales."""
+        Enrollment = apps.get_model('courses', 'Enrollment')
+        enrolled_on = self.until - timedelta(days=365)
+        return self._bulk(Enrollment, [
+            Enrollment(student=student, course=courses[i % len(courses)], enrolled_on=enrolled_on)
+            for i, student in enumerate(students)
+        ])
+
+    def student_attendance(self, students, days):
+        """Una fila por alumno y día (8% de ausencias) y luego los resúmenes mensuales."""
+        StudentAttendance = apps.get_model('students', 'StudentAttendance')
+        batch = []
+        for day in days:
+            for student in students:
+                batch.append(StudentAttendance(student_id=student.pk, date=day, present=self.rnd.random() >= 0.08))
+                if len(batch) >= self.batch_size:
+                    self._bulk(StudentAttendance, batch)
+                    batch = []
+        if batch:
+            self._bulk(StudentAttendance, batch)
+        self.counts['students.StudentAttendanceMonth'] = AttendanceRollup.rebuild(batch_size=self.batch_size)
+
+    def teacher_attendance(self, teachers, days):
+        TeacherAttendance = apps.get_model('teachers', 'TeacherAttendance')
+        return self._bulk(TeacherAttendance, [
+            TeacherAttendance(teacher_id=teacher.pk, date=day, present=self.rnd.random() >= 0.05)
+            for day in days for teacher in teachers
+        ])
+
+    def ledger(self):
+        """Movimientos diarios del libro y un MonthPeriod abierto por mes."""
+        Transaction = apps.get_model('cooperadora', 'Transaction')
+        MonthPeriod = apps.get_model('cooperadora', 'MonthPeriod')
+        months = ledger_months(self.until, self.spec['ledger_years'])
+        self._bulk(MonthPeriod, [MonthPeriod(year=y, month=m) for y, m in months])
+
+        types = [Transaction.INCOME, Transaction.EXPENSE, Transaction.ADJUSTMENT]
+        day = date(*months[0], 1)
+        batch = []
+        while day <= self.until:
+            for _ in range(self.spec['transactions_per_day']):
+                ttype = self.rnd.choices(types, weights=[60, 38, 2])[0]
+                cents = self.rnd.randint(-50000, 50000) if ttype == Transaction.ADJUSTMENT else self.rnd.randint(100, 500000)
+                batch.append(Transaction(date=day, type=ttype, amount=Decimal(cents) / 100, description=f'Movimiento {day}'))
+            if len(batch) >= self.batch_size:
+                self._bulk(Transaction, batch)
+                batch = []
+            day += timedelta(days=1)
+        if batch:
+            self._bulk(Transaction, batch)
+        return months
+
+
+def _division_name(index):
+    """0 -> 'A', 25 -> 'Z', 26 -> 'AA', ..."""
+    name = ''
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        name = chr(ord('A') + rest) + name
+    return name
@@ -0,0 +1,172 @@
+"""Prueba de carga: perfil sync (WSGI) contra perfil asgi (uvicorn) de gunicorn.
+
+Simula el caso que motiva el perfil asgi: mientras `--exporters` clientes
+descargan el CSV del reporte de la cooperadora (lento y largo), `--clients`
+clientes piden una página común (`--path`, por defecto el índice de cursos).
+Con workers sync cada descarga ocupa un worker entero; con ASGI el worker sigue
+atendiendo otros requests entre bloque y bloque del CSV.
+
+Muestra, por perfil, requests/seg, p50/p95 y errores de la página común, y
+cuántas descargas completas se hicieron.
+
+Solo hace pedidos GET (más el login), contra la base que configuren las
+variables de entorno: usar una base de prueba, por ejemplo una generada con
+`python -m scripts.benchmark --keepdb` sobre PostgreSQL.
+
+Uso:
+    # contra un servidor ya levantado
+    python scripts/load_test.py --url http://127.0.0.1:8000 --user admin --password ...
+    # levantar gunicorn con cada perfil (requiere gunicorn y uvicorn instalados)
+    python scripts/load_test.py --start sync,asgi --workers 2 --user admin --password ...
+"""
+import argparse
+import http.cookiejar
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def login(base_url, user, password):
+    """Iniciar sesión en /login/ y devolver el header Cookie con la sesión."""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    page = opener.open(base_url + '/login/').read().decode('utf-8', 'replace')
+    token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', page).group(1)
+    data = urllib.parse.urlencode({'username': user, 'password': password, 'csrfmiddlewaretoken': token}).encode()
+    request = urllib.request.Request(base_url + '/login/', data=data, headers={'Referer': base_url + '/login/'})
+    opener.open(request).read()
+    cookies = {cookie.name: cookie.value for cookie in jar}
+    if 'sessionid' not in cookies:
+        raise SystemExit('No se pudo iniciar sesión: revisar --user y --password.')
+    return '; '.join(f'{name}={value}' for name, value in cookies.items())
+
+
+def fetch(url, cookie):
+    request = urllib.request.Request(url, headers={'Cookie': cookie})
+    with urllib.request.urlopen(request, timeout=120) as response:
+        while response.read(65536):
+            pass
+        return response.status
+
+
+def run(base_url, cookie, path, export_path, clients, exporters, seconds):
+    deadline = time.perf_counter() + seconds
+    latencies, errors, exports = [], [], []
+    lock = threading.Lock()
+
+    def page_client():
+        local = []
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                fetch(base_url + path, cookie)
+                local.append((time.perf_counter() - start) * 1000)
+            except (urllib.error.URLError, OSError) as exc:
+                with lock:
+                    errors.append(str(exc))
+        with lock:
+            latencies.extend(local)
+
+    def export_client():
+        while time.perf_counter() < deadline:
+            try:
+                fetch(base_url + export_path, cookie)
+                with lock:
+                    exports.append(1)
+            except (urllib.error.URLError, OSError) as exc:
+                with lock:
+                    errors.append(str(exc))
+
+    threads = [threading.Thread(target=page_client) for _ in range(clients)]
+    threads += [threading.Thread(target=export_client) for _ in range(exporters)]
+    t0 = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t0
+    return {
+        'requests': len(latencies),
+        'rps': len(latencies) / elapsed,
+        'p50': percentile(latencies, 50) if latencies else 0,
+        'p95': percentile(latencies, 95) if latencies else 0,
+        'exports': len(exports),
+        'errors': len(errors),
+    }
+
+
+def start_server(profile, port, workers, threads):
+    env = dict(os.environ, SERVER_PROFILE=profile, GUNICORN_BIND=f'127.0.0.1:{port}',
+               GUNICORN_WORKERS=str(workers), GUNICORN_THREADS=str(threads), GUNICORN_ACCESSLOG='')
+    # varios workers necesitan un cache compartido (ver gunicorn.conf.py)
+    env.setdefault('CACHE_BACKEND', 'file')
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py'],
+        cwd=ROOT, env=env,
+    )
+    base_url = f'http://127.0.0.1:{port}'
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(base_url + '/login/', timeout=1).read()
+            return server, base_url
+        except (urllib.error.URLError, OSError):
+            if server.poll() is not None:
+                raise SystemExit(f'gunicorn ({profile}) terminó al arrancar con código {server.returncode}')
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit(f'gunicorn ({profile}) no respondió en {base_url}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='servidor ya levantado (en vez de --start)')
+    parser.add_argument('--start', help='perfiles a levantar con gunicorn, separados por coma (sync,asgi)')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=2, help='workers de gunicorn con --start')
+    parser.add_argument('--threads', type=int, default=1, help='hilos por worker del perfil sync con --start')
+    parser.add_argument('--user', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--path', default='/courses/')
+    parser.add_argument('--export-path', default='/cooperadora/report/?format=csv')
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--exporters', type=int, default=2)
+    parser.add_argument('--seconds', type=float, default=20)
+    args = parser.parse_args()
+    if bool(args.url) == bool(args.start):
+        parser.error('indicar --url o --start')
+
+    targets = [(args.url, None)] if args.url else [(None, p.strip()) for p in args.start.split(',')]
+    print(f'{args.clients} clientes en {args.path} + {args.exporters} descargando {args.export_path}, '
+          f'{args.seconds:g}s\n')
+    print(f'{"perfil":<10}{"requests":>10}{"req/s":>10}{"p50 ms":>10}{"p95 ms":>10}{"CSVs":>8}{"errores":>10}')
+    for url, profile in targets:
+        server = None
+        if profile:
+            server, url = start_server(profile, args.port, args.workers, args.threads)
+        try:
+            cookie = login(url.rstrip('/'), args.user, args.password)
+            row = run(url.rstrip('/'), cookie, args.path, args.export_path, args.clients, args.exporters, args.seconds)
+        finally:
+            if server:
+                server.terminate()
+                server.wait()
+        print(f'{profile or "url":<10}{row["requests"]:>10}{row["rps"]:>10.1f}{row["p50"]:>10.1f}'
+              f'{row["p95"]:>10.1f}{row["exports"]:>8}{row["errors"]:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Student, StudentAttendance
+from .models import Student, StudentAttendance, StudentAttendanceMonth
 
 
 @admin.register(Student)
@@ -11,3 +11,9 @@ class StudentAdmin(admin.ModelAdmin):
 class StudentAttendanceAdmin(admin.ModelAdmin):
     list_display = ('student', 'date', 'present')
     list_filter = ('date', 'present')
+
+
+@admin.register(StudentAttendanceMonth)
+class StudentAttendanceMonthAdmin(admin.ModelAdmin):
+    list_display = ('student', 'month', 'present', 'absent')
+    list_filter = ('month',)
@@ -4,3 +4,32 @@ from django.apps import AppConfig
 class StudentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'students'
+
+    def ready(self):
+        # Mantener el resumen mensual de asistencia al guardar/borrar filas sueltas
+        # (la planilla por curso actualiza el resumen por su cuenta, ver AttendanceSheet.save)
+        from django.db.models.signals import post_delete, post_save, pre_save
+        pre_save.connect(remember_attendance_key, sender='students.StudentAttendance')
+        post_save.connect(refresh_attendance_rollup, sender='students.StudentAttendance')
+        post_delete.connect(refresh_attendance_rollup, sender='students.StudentAttendance')
+
+
+def remember_attendance_key(sender, instance, raw=False, **kwargs):
+    """Guardar alumno y fecha previos para actualizar también el mes viejo si cambian."""
+    if raw or instance.pk is None:
+        return
+    instance._previous_attendance_key = (
+        sender.objects.filter(pk=instance.pk).values_list('student_id', 'date').first()
+    )
+
+
+def refresh_attendance_rollup(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from students.services import AttendanceRollup
+    keys = [(instance.student_id, instance.date)]
+    previous = getattr(instance, '_previous_attendance_key', None)
+    if previous and previous != keys[0]:
+        keys.append(previous)
+    for student_id, day in keys:
+        AttendanceRollup.refresh([student_id], [day])
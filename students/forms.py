@@ -0,0 +1,49 @@
+from datetime import date
+
+from django import forms
+from django.apps import apps
+from django.utils import timezone
+
+
+class AttendanceDateForm(forms.Form):
+    """Fecha de la planilla de asistencia (por defecto, hoy)."""
+    date = forms.DateField(label='Fecha', widget=forms.DateInput(attrs={'type': 'date'}))
+
+    def clean_date(self):
+        value = self.cleaned_data['date']
+        if value > timezone.localdate():
+            raise forms.ValidationError('No se puede tomar asistencia de una fecha futura.')
+        return value
+
+
+class AttendanceReportForm(forms.Form):
+    """Filtros del reporte de asistencia: período (por meses completos), curso y umbral."""
+    date_from = forms.DateField(label='Desde', required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(label='Hasta', required=False, widget=forms.DateInput(attrs={'type': 'date'}))
+    course = forms.ModelChoiceField(
+        label='Curso', required=False, empty_label='Todos',
+        queryset=apps.get_model('courses', 'Course').objects.order_by('level__order', 'division__name'),
+    )
+    threshold = forms.IntegerField(label='Ausencias mayores a (%)', required=False, min_value=0, max_value=100)
+
+    DEFAULT_THRESHOLD = 15
+
+    def clean(self):
+        cleaned = super().clean()
+        date_from, date_to = cleaned.get('date_from'), cleaned.get('date_to')
+        if date_from and date_to and date_from > date_to:
+            raise forms.ValidationError('La fecha "desde" es posterior a "hasta".')
+        return cleaned
+
+    def filters(self):
+        """(date_from, date_to, course, threshold 0-1) con valores por defecto: del 1 de
+        enero del año en curso a hoy, todos los cursos y 15 %."""
+        data = self.cleaned_data if self.is_bound and self.is_valid() else {}
+        today = timezone.localdate()
+        threshold = data.get('threshold')
+        return (
+            data.get('date_from') or date(today.year, 1, 1),
+            data.get('date_to') or today,
+            data.get('course'),
+            (self.DEFAULT_THRESHOLD if threshold is None else threshold) / 100,
+        )
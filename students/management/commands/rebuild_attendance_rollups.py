@@ -0,0 +1,18 @@
+"""Regenerar el resumen mensual de asistencia de alumnos desde las filas de asistencia.
+
+Ejemplo:
+    py manage.py rebuild_attendance_rollups
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from students.services import AttendanceRollup
+
+
+class Command(BaseCommand):
+    help = 'Regenera StudentAttendanceMonth (presentes/ausentes por alumno y mes) desde StudentAttendance.'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = AttendanceRollup.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Resúmenes regenerados: {count} filas (alumno, mes).'))
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.25 on 2026-10-18 13:19
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicate_attendance(apps, schema_editor):
+    """Dejar una sola asistencia por (alumno, día), la última cargada, antes de la restricción única."""
+    StudentAttendance = apps.get_model('students', 'StudentAttendance')
+    keep = (
+        StudentAttendance.objects.values('student_id', 'date')
+        .annotate(last_id=Max('id'))
+        .values_list('last_id', flat=True)
+    )
+    StudentAttendance.objects.exclude(id__in=list(keep)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0003_person_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_attendance, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='studentattendance',
+            index=models.Index(fields=['date'], name='students_attendance_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='studentattendance',
+            constraint=models.UniqueConstraint(fields=('student', 'date'), name='students_attendance_student_date_uniq'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.25 on 2026-10-18 13:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    """Cargar el resumen mensual con la asistencia existente (una consulta agrupada)."""
+    StudentAttendance = apps.get_model('students', 'StudentAttendance')
+    StudentAttendanceMonth = apps.get_model('students', 'StudentAttendanceMonth')
+    rows = (
+        StudentAttendance.objects.annotate(period=TruncMonth('date'))
+        .order_by()
+        .values('student_id', 'period')
+        .annotate(
+            present_count=Count('id', filter=Q(present=True)),
+            absent_count=Count('id', filter=Q(present=False)),
+        )
+    )
+    StudentAttendanceMonth.objects.bulk_create([
+        StudentAttendanceMonth(
+            student_id=row['student_id'], month=row['period'],
+            present=row['present_count'], absent=row['absent_count'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_attendance_unique_student_date'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAttendanceMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='Primer día del mes')),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('absent', models.PositiveIntegerField(default=0)),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_months', to='students.student')),
+            ],
+            options={
+                'verbose_name': 'Resumen mensual de asistencia',
+                'verbose_name_plural': 'Resúmenes mensuales de asistencia',
+                'indexes': [models.Index(fields=['month', 'student'], name='students_attmonth_month_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studentattendancemonth',
+            constraint=models.UniqueConstraint(fields=('student', 'month'), name='students_attmonth_student_month_uniq'),
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
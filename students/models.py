@@ -16,6 +16,43 @@ class StudentAttendance(models.Model):
     class Meta:
         verbose_name = 'Asistencia estudiante'
         verbose_name_plural = 'Asistencias estudiantes'
+        constraints = [
+            # una fila por alumno y día; permite el upsert de la planilla del curso
+            models.UniqueConstraint(fields=['student', 'date'], name='students_attendance_student_date_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='students_attendance_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.student} - {self.date} - {'P' if self.present else 'A'}"
+
+
+class StudentAttendanceMonth(models.Model):
+    """Resumen mensual de asistencia por alumno (presentes y ausentes).
+
+    Se mantiene incrementalmente desde `students.services.AttendanceRollup` cada vez
+    que se guarda asistencia; los reportes por período leen esta tabla en vez de
+    recorrer todas las filas de StudentAttendance.
+    """
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='attendance_months')
+    month = models.DateField(help_text='Primer día del mes')
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Resumen mensual de asistencia'
+        verbose_name_plural = 'Resúmenes mensuales de asistencia'
+        constraints = [
+            models.UniqueConstraint(fields=['student', 'month'], name='students_attmonth_student_month_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['month', 'student'], name='students_attmonth_month_idx'),
+        ]
+
+    @property
+    def total(self):
+        return self.present + self.absent
+
+    def __str__(self):
+        return f"{self.student} - {self.month:%Y-%m} - {self.absent}/{self.total} ausencias"
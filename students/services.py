@@ -0,0 +1,237 @@
+"""Servicios de la app `students`.
+
+Usar `apps.get_model()` para referenciar modelos de otras apps y evitar imports circulares.
+"""
+from datetime import date
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Q, Sum
+from django.db.models.functions import Cast, NullIf, TruncMonth
+
+
+def month_start(value):
+    """Primer día del mes de `value`."""
+    return value.replace(day=1)
+
+
+def next_month_start(value):
+    """Primer día del mes siguiente al de `value`."""
+    return date(value.year + 1, 1, 1) if value.month == 12 else date(value.year, value.month + 1, 1)
+
+
+class AttendanceSheet:
+    """Planilla diaria de asistencia de un curso.
+
+    El padrón sale de `Enrollment` en una sola consulta y la planilla completa se
+    guarda con un único upsert (`bulk_create(update_conflicts=True)`) sobre la
+    restricción única (student, date) de StudentAttendance: tomar lista a un curso
+    de 40 alumnos es un solo INSERT ... ON CONFLICT DO UPDATE.
+    """
+
+    def __init__(self, course, date):
+        Course = apps.get_model('courses', 'Course')
+        if not hasattr(course, 'pk'):
+            course = Course.objects.select_related('level', 'division').get(pk=course)
+        self.course = course
+        self.date = date
+
+    def roster(self):
+        """Alumnos matriculados en el curso, ordenados por apellido y nombre."""
+        Student = apps.get_model('students', 'Student')
+        return list(
+            Student.objects.filter(enrollment__course=self.course)
+            .order_by('last_name', 'first_name', 'id')
+        )
+
+    def roster_ids(self):
+        """PKs del padrón (sin cargar las filas completas)."""
+        Enrollment = apps.get_model('courses', 'Enrollment')
+        return list(Enrollment.objects.filter(course=self.course).values_list('student_id', flat=True))
+
+    def existing(self):
+        """Asistencias ya cargadas para la fecha: {student_id: StudentAttendance}."""
+        StudentAttendance = apps.get_model('students', 'StudentAttendance')
+        rows = StudentAttendance.objects.filter(date=self.date, student__enrollment__course=self.course)
+        return {row.student_id: row for row in rows}
+
+    def rows(self):
+        """Padrón con lo cargado para la fecha: lista de (student, present, notes).
+
+        Los alumnos sin registro figuran presentes, como el valor por defecto del modelo.
+        """
+        existing = self.existing()
+        result = []
+        for student in self.roster():
+            row = existing.get(student.pk)
+            result.append((student, row.present if row else True, row.notes if row else ''))
+        return result
+
+    def save(self, marks, roster_ids=None):
+        """Guardar la planilla completa en un solo upsert.
+
+        El upsert y la actualización del resumen mensual van en una misma
+        transacción: si falla el resumen no queda la asistencia guardada sin él.
+
+        Args:
+            marks: dict {student_id: (present, notes)}; los alumnos del padrón que no
+                figuran se guardan como ausentes (casilla sin marcar en el formulario).
+            roster_ids: PKs del padrón si ya se cargaron (evita volver a consultarlo).
+
+        Returns:
+            cantidad de filas guardadas. Se ignoran los alumnos que no están en el curso.
+        """
+        StudentAttendance = apps.get_model('students', 'StudentAttendance')
+        if roster_ids is None:
+            roster_ids = self.roster_ids()
+        objs = []
+        for pk in roster_ids:
+            present, notes = marks.get(pk, (False, ''))
+            objs.append(StudentAttendance(student_id=pk, date=self.date, present=present, notes=notes or ''))
+        with transaction.atomic():
+            StudentAttendance.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=['student', 'date'],
+                update_fields=['present', 'notes'],
+            )
+            # bulk_create no dispara señales: actualizar el resumen mensual del padrón
+            AttendanceRollup.refresh(roster_ids, [self.date])
+        return len(objs)
+
+
+class AttendanceRollup:
+    """Mantenimiento de StudentAttendanceMonth (presentes/ausentes por alumno y mes).
+
+    La actualización es incremental: solo se recalculan los pares (alumno, mes)
+    afectados, con una consulta agrupada sobre las filas de esos alumnos en esos
+    meses y un upsert. Recalcular (en vez de sumar deltas) hace que altas, cambios
+    de presente/ausente, cambios de fecha y bajas queden bien sin casos especiales.
+
+    Se llama desde `AttendanceSheet.save` y desde las señales de StudentAttendance
+    (ver `StudentsConfig.ready`).
+    """
+
+    @staticmethod
+    def _counts(queryset):
+        return (
+            queryset.annotate(period=TruncMonth('date'))
+            .order_by()
+            .values('student_id', 'period')
+            .annotate(
+                present_count=Count('id', filter=Q(present=True)),
+                absent_count=Count('id', filter=Q(present=False)),
+            )
+        )
+
+    @classmethod
+    def refresh(cls, student_ids, dates):
+        """Recalcular el resumen de `student_ids` en los meses de `dates`."""
+        StudentAttendance = apps.get_model('students', 'StudentAttendance')
+        StudentAttendanceMonth = apps.get_model('students', 'StudentAttendanceMonth')
+        student_ids = list(set(student_ids))
+        months = sorted({month_start(d) for d in dates})
+        if not student_ids or not months:
+            return
+        in_months = Q()
+        for start in months:
+            in_months |= Q(date__gte=start, date__lt=next_month_start(start))
+        rows = cls._counts(StudentAttendance.objects.filter(in_months, student_id__in=student_ids))
+        summaries = [
+            StudentAttendanceMonth(
+                student_id=row['student_id'], month=row['period'],
+                present=row['present_count'], absent=row['absent_count'],
+            )
+            for row in rows
+        ]
+        # pares que ya no tienen filas (bajas o cambio de fecha): se borran
+        keep = {(summary.student_id, summary.month) for summary in summaries}
+        stale = [
+            pk for pk, student_id, month in StudentAttendanceMonth.objects.filter(
+                student_id__in=student_ids, month__in=months,
+            ).values_list('pk', 'student_id', 'month')
+            if (student_id, month) not in keep
+        ]
+        if stale:
+            StudentAttendanceMonth.objects.filter(pk__in=stale).delete()
+        StudentAttendanceMonth.objects.bulk_create(
+            summaries,
+            update_conflicts=True,
+            unique_fields=['student', 'month'],
+            update_fields=['present', 'absent'],
+        )
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """Regenerar toda la tabla de resúmenes desde StudentAttendance."""
+        StudentAttendance = apps.get_model('students', 'StudentAttendance')
+        StudentAttendanceMonth = apps.get_model('students', 'StudentAttendanceMonth')
+        StudentAttendanceMonth.objects.all().delete()
+        summaries = [
+            StudentAttendanceMonth(
+                student_id=row['student_id'], month=row['period'],
+                present=row['present_count'], absent=row['absent_count'],
+            )
+            for row in cls._counts(StudentAttendance.objects.all()).iterator()
+        ]
+        StudentAttendanceMonth.objects.bulk_create(summaries, batch_size=batch_size)
+        return len(summaries)
+
+
+class AttendanceStats:
+    """Reportes de asistencia por período leyendo los resúmenes mensuales.
+
+    Los períodos se toman por meses completos: `date_from` y `date_to` se redondean
+    al mes que los contiene (un trimestre o cuatrimestre es un rango de meses).
+    Cada método devuelve un queryset de diccionarios con `present`, `absent`,
+    `total` y `absence_rate` (0 a 1).
+    """
+
+    @staticmethod
+    def _rollups(date_from=None, date_to=None, course=None):
+        StudentAttendanceMonth = apps.get_model('students', 'StudentAttendanceMonth')
+        qs = StudentAttendanceMonth.objects.all()
+        if date_from:
+            qs = qs.filter(month__gte=month_start(date_from))
+        if date_to:
+            qs = qs.filter(month__lte=month_start(date_to))
+        if course is not None:
+            qs = qs.filter(student__enrollment__course=course)
+        return qs
+
+    @staticmethod
+    def _totals(qs, *group_by):
+        return (
+            qs.order_by().values(*group_by)
+            .annotate(present=Sum('present'), absent=Sum('absent'))
+            .annotate(total=F('present') + F('absent'))
+            .annotate(absence_rate=Cast('absent', FloatField()) / NullIf(Cast('total', FloatField()), 0.0))
+        )
+
+    @classmethod
+    def per_student(cls, date_from=None, date_to=None, course=None):
+        """Totales por alumno (con apellido y nombre), ordenados por apellido."""
+        return cls._totals(
+            cls._rollups(date_from, date_to, course),
+            'student_id', 'student__last_name', 'student__first_name',
+        ).order_by('student__last_name', 'student__first_name', 'student_id')
+
+    @classmethod
+    def per_course(cls, date_from=None, date_to=None):
+        """Totales por curso de los alumnos matriculados."""
+        return cls._totals(
+            cls._rollups(date_from, date_to).filter(student__enrollment__isnull=False),
+            'student__enrollment__course_id', 'student__enrollment__course__name',
+        ).order_by('student__enrollment__course__name')
+
+    @classmethod
+    def per_month(cls, date_from=None, date_to=None, course=None):
+        """Totales por mes."""
+        return cls._totals(cls._rollups(date_from, date_to, course), 'month').order_by('month')
+
+    @classmethod
+    def students_above(cls, threshold, date_from=None, date_to=None, course=None):
+        """Alumnos con tasa de ausencias mayor a `threshold` (ej. 0.15), de mayor a menor."""
+        return cls.per_student(date_from, date_to, course).filter(absence_rate__gt=threshold).order_by(
+            '-absence_rate', 'student__last_name',
+        )
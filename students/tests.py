@@ -0,0 +1,184 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from core.services import PersonSearch
+from courses.models import Course, Division, Enrollment, Level
+
+from .models import Student, StudentAttendance, StudentAttendanceMonth
+from .services import AttendanceRollup, AttendanceSheet, AttendanceStats
+
+
+class PersonSearchTests(TestCase):
+    def setUp(self):
+        Student.objects.create(first_name='Ana', last_name='Pérez', dni='20.123.456')
+        Student.objects.create(first_name='Juan', last_name='Anaya')
+        Student.objects.create(first_name='Luis', last_name='Gómez')
+
+    def search(self, query):
+        return sorted(str(s) for s in PersonSearch.filter(Student.objects.all(), query))
+
+    def test_matches_last_name_first_name_and_dni(self):
+        self.assertEqual(self.search('ana'), ['Anaya, Juan', 'Pérez, Ana'])
+        self.assertEqual(self.search('perez ana'), ['Pérez, Ana'])
+        self.assertEqual(self.search('Ana Pérez'), ['Pérez, Ana'])
+        self.assertEqual(self.search('luis gom'), ['Gómez, Luis'])
+        self.assertEqual(self.search('20.123'), ['Pérez, Ana'])
+
+    def test_query_that_normalizes_to_nothing_returns_everything(self):
+        # un acento suelto (U+0301) queda vacío al normalizar
+        self.assertEqual(len(self.search('́')), 3)
+        self.assertEqual(len(self.search(' ́̈ ')), 3)
+
+    def test_list_view_with_combining_mark_query(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        response = self.client.get(reverse('students:list'), {'q': '́'})
+        self.assertEqual(response.status_code, 200)
+
+
+class AttendanceSheetTests(TestCase):
+    def setUp(self):
+        level = Level.objects.create(order=1, name='Primero')
+        self.course = Course.objects.create(level=level, division=Division.objects.create(name='A'))
+        self.students = Student.objects.bulk_create([
+            Student(first_name=f'Alumno {i}', last_name='P') for i in range(3)
+        ])
+        Enrollment.objects.bulk_create([Enrollment(student=s, course=self.course) for s in self.students])
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+
+    def post_sheet(self, day, present):
+        return self.client.post(reverse('students:attendance', args=[self.course.pk]), {
+            'date': day.isoformat(),
+            'student': [str(s.pk) for s in self.students],
+            'present': [str(s.pk) for s in present],
+        })
+
+    def rollup(self, student):
+        return StudentAttendanceMonth.objects.filter(student=student).values_list('month', 'present', 'absent')
+
+    def test_post_saves_attendance_and_monthly_rollup(self):
+        first, second, third = self.students
+        response = self.post_sheet(date(2024, 3, 4), present=[first, second])
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            dict(StudentAttendance.objects.values_list('student_id', 'present')),
+            {first.pk: True, second.pk: True, third.pk: False},
+        )
+        self.post_sheet(date(2024, 3, 5), present=[first])
+        # volver a cargar el mismo día reemplaza la marca en vez de duplicarla
+        self.post_sheet(date(2024, 3, 5), present=[first, third])
+        self.assertEqual(StudentAttendance.objects.count(), 6)
+        self.assertEqual(list(self.rollup(first)), [(date(2024, 3, 1), 2, 0)])
+        self.assertEqual(list(self.rollup(second)), [(date(2024, 3, 1), 1, 1)])
+        self.assertEqual(list(self.rollup(third)), [(date(2024, 3, 1), 1, 1)])
+
+    def test_failed_rollup_rolls_back_attendance(self):
+        sheet = AttendanceSheet(self.course, date(2024, 3, 4))
+        with mock.patch.object(AttendanceRollup, 'refresh', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                sheet.save({})
+        self.assertFalse(StudentAttendance.objects.exists())
+        self.assertFalse(StudentAttendanceMonth.objects.exists())
+
+
+class AttendanceStatsTests(TestCase):
+    """Los reportes leen StudentAttendanceMonth: tienen que coincidir con contar las
+    filas de StudentAttendance, también después de ediciones y bajas sueltas."""
+
+    def setUp(self):
+        level = Level.objects.create(order=1, name='Primero')
+        self.courses = [
+            Course.objects.create(level=level, division=Division.objects.create(name=name)) for name in 'AB'
+        ]
+        self.students = Student.objects.bulk_create([
+            Student(first_name=f'Alumno {i}', last_name=f'S{i}') for i in range(6)
+        ])
+        Enrollment.objects.bulk_create([
+            Enrollment(student=s, course=self.courses[i % 2]) for i, s in enumerate(self.students)
+        ])
+        # marzo y abril: el alumno i falta un día de cada (i + 2)
+        for course in self.courses:
+            for day in [date(2024, 3, d) for d in range(4, 16)] + [date(2024, 4, d) for d in range(1, 11)]:
+                roster = [s for i, s in enumerate(self.students) if self.courses[i % 2] == course]
+                marks = {s.pk: (day.day % (self.students.index(s) + 2) != 0, '') for s in roster}
+                AttendanceSheet(course, day).save(marks)
+
+    def raw_counts(self, key, date_from=date(2024, 1, 1), date_to=date(2024, 12, 31)):
+        """{clave: (presentes, ausentes)} contando filas de StudentAttendance en Python."""
+        counts = {}
+        enrolled = dict(Enrollment.objects.values_list('student_id', 'course_id'))
+        for row in StudentAttendance.objects.filter(date__gte=date_from, date__lte=date_to):
+            k = key(row, enrolled)
+            present, absent = counts.get(k, (0, 0))
+            counts[k] = (present + row.present, absent + (not row.present))
+        return counts
+
+    def assertMatchesRaw(self):
+        self.assertEqual(
+            {r['student_id']: (r['present'], r['absent']) for r in AttendanceStats.per_student()},
+            self.raw_counts(lambda row, enrolled: row.student_id),
+        )
+        self.assertEqual(
+            {r['month']: (r['present'], r['absent']) for r in AttendanceStats.per_month()},
+            self.raw_counts(lambda row, enrolled: row.date.replace(day=1)),
+        )
+        self.assertEqual(
+            {r['student__enrollment__course_id']: (r['present'], r['absent']) for r in AttendanceStats.per_course()},
+            self.raw_counts(lambda row, enrolled: enrolled[row.student_id]),
+        )
+        # un curso en abril
+        april = self.raw_counts(lambda row, enrolled: (enrolled[row.student_id], row.student_id),
+                                date(2024, 4, 1), date(2024, 4, 30))
+        self.assertEqual(
+            {r['student_id']: (r['present'], r['absent'])
+             for r in AttendanceStats.per_student(date(2024, 4, 1), date(2024, 4, 30), self.courses[0])},
+            {student_id: v for (course_id, student_id), v in april.items() if course_id == self.courses[0].pk},
+        )
+
+    def test_rollups_match_raw_rows_after_sheet_saves(self):
+        self.assertMatchesRaw()
+
+    def test_rollups_match_raw_rows_after_edits_moves_and_deletes(self):
+        rows = list(StudentAttendance.objects.order_by('pk'))
+        # presente <-> ausente
+        rows[0].present = not rows[0].present
+        rows[0].save()
+        # de marzo a mayo (un mes sin otras filas)
+        rows[1].date = date(2024, 5, 2)
+        rows[1].save()
+        # otro alumno, otro mes
+        rows[2].student = self.students[5]
+        rows[2].date = date(2024, 6, 3)
+        rows[2].save()
+        rows[3].delete()
+        StudentAttendance.objects.create(student=self.students[0], date=date(2024, 7, 1), present=False)
+        self.assertMatchesRaw()
+        self.assertEqual(StudentAttendanceMonth.objects.filter(month=date(2024, 5, 1)).count(), 1)
+
+    def test_students_above_threshold(self):
+        above = AttendanceStats.students_above(0.15)
+        expected = {
+            pk for pk, (present, absent) in self.raw_counts(lambda row, enrolled: row.student_id).items()
+            if absent / (present + absent) > 0.15
+        }
+        self.assertEqual({r['student_id'] for r in above}, expected)
+        rates = [r['absence_rate'] for r in above]
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        self.assertTrue(expected)
+
+    def test_report_view(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        response = self.client.get(reverse('students:attendance_report'), {
+            'date_from': '2024-03-01', 'date_to': '2024-04-30', 'threshold': '15',
+        })
+        self.assertEqual(response.status_code, 200)
+        above = list(response.context['above'])
+        self.assertTrue(above)
+        self.assertContains(response, f"{above[0]['student__last_name']}, {above[0]['student__first_name']}")
+        self.assertEqual(len(response.context['per_month']), 2)
+        response = self.client.get(reverse('students:attendance_report'), {'date_from': '2024-05-01', 'date_to': '2024-04-01'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['form'].errors)
@@ -8,4 +8,6 @@ urlpatterns = [
     path('new/', views.StudentCreateView.as_view(), name='create'),
     path('<int:pk>/edit/', views.StudentUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.StudentDeleteView.as_view(), name='delete'),
+    path('attendance/report/', views.AttendanceReportView.as_view(), name='attendance_report'),
+    path('attendance/<int:course_id>/', views.AttendanceSheetView.as_view(), name='attendance'),
 ]
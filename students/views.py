@@ -1,11 +1,20 @@
+from django.apps import apps
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.urls import reverse_lazy
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.http import Http404
+from django.shortcuts import redirect
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, TemplateView
 
+from core.views import PersonSearchListMixin
+
+from .forms import AttendanceDateForm, AttendanceReportForm
 from .models import Student
+from .services import AttendanceSheet, AttendanceStats
 
 
-class StudentListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class StudentListView(LoginRequiredMixin, PermissionRequiredMixin, PersonSearchListMixin, ListView):
     model = Student
     template_name = 'students/student_list.html'
     context_object_name = 'students'
@@ -43,3 +52,62 @@ class StudentDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView)
     template_name = 'students/student_confirm_delete.html'
     permission_required = 'students.delete_student'
     success_url = reverse_lazy('students:list')
+
+
+class AttendanceSheetView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
+    """Planilla diaria de asistencia de un curso: todo el padrón se guarda en un solo envío."""
+    template_name = 'students/attendance_sheet.html'
+    permission_required = 'students.add_studentattendance'
+
+    def get_sheet(self, date):
+        try:
+            return AttendanceSheet(self.kwargs['course_id'], date)
+        except apps.get_model('courses', 'Course').DoesNotExist:
+            raise Http404('Curso inexistente')
+
+    def get(self, request, *args, **kwargs):
+        form = AttendanceDateForm(request.GET or {'date': timezone.localdate()})
+        date = form.cleaned_data['date'] if form.is_valid() else timezone.localdate()
+        sheet = self.get_sheet(date)
+        return self.render_to_response(self.get_context_data(form=form, sheet=sheet, rows=sheet.rows()))
+
+    def post(self, request, *args, **kwargs):
+        form = AttendanceDateForm(request.POST)
+        if not form.is_valid():
+            sheet = self.get_sheet(timezone.localdate())
+            return self.render_to_response(self.get_context_data(form=form, sheet=sheet, rows=sheet.rows()))
+        sheet = self.get_sheet(form.cleaned_data['date'])
+        present = set(request.POST.getlist('present'))
+        # ids no numéricos (formulario adulterado) se ignoran; igual se cruzan con el padrón
+        roster_ids = [int(pk) for pk in request.POST.getlist('student') if pk.isdecimal()]
+        marks = {
+            pk: (str(pk) in present, request.POST.get(f'notes_{pk}', '').strip())
+            for pk in roster_ids
+        }
+        # solo alumnos del curso: el padrón se vuelve a leer (una consulta) y se cruza con lo enviado
+        saved = sheet.save(marks, roster_ids=[pk for pk in sheet.roster_ids() if pk in marks])
+        messages.success(request, f'Asistencia guardada: {saved} alumnos de {sheet.course}.')
+        url = reverse('students:attendance', args=[sheet.course.pk])
+        return redirect(f"{url}?date={sheet.date.isoformat()}")
+
+
+class AttendanceReportView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
+    """Reporte de asistencia por período desde los resúmenes mensuales (ver AttendanceStats)."""
+    template_name = 'students/attendance_report.html'
+    permission_required = 'students.view_studentattendance'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = AttendanceReportForm(self.request.GET or None)
+        date_from, date_to, course, threshold = form.filters()
+        context.update({
+            'form': form,
+            'date_from': date_from,
+            'date_to': date_to,
+            'course': course,
+            'threshold': round(threshold * 100),
+            'per_month': AttendanceStats.per_month(date_from, date_to, course),
+            'per_course': None if course else AttendanceStats.per_course(date_from, date_to),
+            'above': AttendanceStats.students_above(threshold, date_from, date_to, course),
+        })
+        return context
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class TeachersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'teachers'
+
+    def ready(self):
+        # Recalcular la carga horaria cuando cambian asignaciones, materias o docentes
+        from django.db.models.signals import post_delete, post_save
+        for sender in ('courses.CourseMaterial', 'subjects.Subject', 'teachers.Teacher'):
+            post_save.connect(invalidate_workload, sender=sender)
+            post_delete.connect(invalidate_workload, sender=sender)
+
+
+def invalidate_workload(sender, **kwargs):
+    """Invalidar el cache de carga horaria docente."""
+    from teachers.services import TeacherWorkload
+    TeacherWorkload.invalidate()
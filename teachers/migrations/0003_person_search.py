@@ -0,0 +1,37 @@
+# Generated by Django 4.2.25 on 2026-10-18 13:18
+
+from django.db import migrations, models
+
+from core.migration_helpers import backfill_search_columns, trigram_index
+
+create_trigram_index, drop_trigram_index = trigram_index('teachers_teacher', 'teachers_teacher_sname_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0002_teacher_between_streets_teacher_locality_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teacher',
+            name='search_dni',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='teacher',
+            name='search_name',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['search_name', 'id'], name='teachers_teacher_sname_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['search_dni'], name='teachers_teacher_sdni_idx'),
+        ),
+        migrations.RunPython(backfill_search_columns('teachers', 'Teacher'), migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
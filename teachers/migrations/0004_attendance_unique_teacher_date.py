@@ -0,0 +1,34 @@
+# Generated by Django 4.2.25 on 2026-10-18 13:21
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def drop_duplicate_attendance(apps, schema_editor):
+    """Dejar una sola asistencia por (docente, día), la última cargada, antes de la restricción única."""
+    TeacherAttendance = apps.get_model('teachers', 'TeacherAttendance')
+    keep = (
+        TeacherAttendance.objects.values('teacher_id', 'date')
+        .annotate(last_id=Max('id'))
+        .values_list('last_id', flat=True)
+    )
+    TeacherAttendance.objects.exclude(id__in=list(keep)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0003_person_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_attendance, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='teacherattendance',
+            index=models.Index(fields=['date', 'teacher'], name='teachers_attendance_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='teacherattendance',
+            constraint=models.UniqueConstraint(fields=('teacher', 'date'), name='teachers_attendance_teacher_date_uniq'),
+        ),
+    ]
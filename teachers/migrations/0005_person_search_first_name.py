@@ -0,0 +1,25 @@
+# Generated by Django 4.2.25 on 2026-10-18 13:46
+
+from django.db import migrations, models
+
+from core.migration_helpers import backfill_search_name_first
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0004_attendance_unique_teacher_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teacher',
+            name='search_name_first',
+            field=models.CharField(blank=True, editable=False, max_length=201),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(fields=['search_name_first'], name='teachers_teacher_snamef_idx'),
+        ),
+        migrations.RunPython(backfill_search_name_first('teachers', 'Teacher'), migrations.RunPython.noop),
+    ]
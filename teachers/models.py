@@ -14,5 +14,15 @@ class TeacherAttendance(models.Model):
     present = models.BooleanField(default=True)
     notes = models.TextField(blank=True)
 
+    class Meta:
+        constraints = [
+            # una fila por docente y día; permite el upsert de la grilla mensual
+            models.UniqueConstraint(fields=['teacher', 'date'], name='teachers_attendance_teacher_date_uniq'),
+        ]
+        indexes = [
+            # recorridos por rango de fechas (grilla del mes, exportación, estadísticas)
+            models.Index(fields=['date', 'teacher'], name='teachers_attendance_date_idx'),
+        ]
+
     def __str__(self):
         return f"{self.teacher} - {self.date} - {'P' if self.present else 'A'}"
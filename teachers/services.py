@@ -0,0 +1,175 @@
+"""Servicios de la app `teachers`.
+
+Usar `apps.get_model()` para referenciar modelos de otras apps y evitar imports circulares.
+"""
+import calendar
+from datetime import date, timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Coalesce
+
+from core.services import CacheVersion
+
+
+class TeacherAttendanceGrid:
+    """Grilla mensual de asistencia docente (docentes x días del mes).
+
+    - `rows()` carga la grilla con dos consultas: docentes y asistencias del mes
+      (rango sobre el índice (date, teacher)).
+    - `save(cells)` compara lo enviado con lo guardado y escribe solo las celdas
+      cambiadas: un único upsert para presentes/ausentes y un DELETE para las
+      celdas que se vaciaron.
+    - `csv_rows()` genera las filas para la exportación de liquidación sin cargar
+      todo el mes en memoria.
+
+    Cada celda vale True (presente), False (ausente) o None (sin registro).
+    """
+
+    def __init__(self, year, month):
+        self.year = year
+        self.month = month
+        self.first_day = date(year, month, 1)
+        self.days = [self.first_day + timedelta(days=i) for i in range(calendar.monthrange(year, month)[1])]
+        self.last_day = self.days[-1]
+
+    def _attendance(self):
+        TeacherAttendance = apps.get_model('teachers', 'TeacherAttendance')
+        return TeacherAttendance.objects.filter(date__gte=self.first_day, date__lte=self.last_day)
+
+    def teachers(self):
+        Teacher = apps.get_model('teachers', 'Teacher')
+        return Teacher.objects.order_by('last_name', 'first_name', 'id')
+
+    def cells(self):
+        """Asistencias guardadas del mes: {(teacher_id, date): present}."""
+        return {
+            (teacher_id, day): present
+            for teacher_id, day, present in self._attendance().values_list('teacher_id', 'date', 'present')
+        }
+
+    def rows(self):
+        """Lista de (teacher, [celda por día]) con dos consultas."""
+        cells = self.cells()
+        return [
+            (teacher, [cells.get((teacher.pk, day)) for day in self.days])
+            for teacher in self.teachers()
+        ]
+
+    @transaction.atomic
+    def save(self, cells):
+        """Guardar las celdas enviadas que cambiaron respecto de lo guardado.
+
+        Args:
+            cells: dict {(teacher_id, date): True | False | None}; las fechas fuera
+                del mes se ignoran.
+
+        Returns:
+            dict con `saved` (celdas escritas) y `cleared` (celdas borradas).
+        """
+        TeacherAttendance = apps.get_model('teachers', 'TeacherAttendance')
+        current = self.cells()
+        upserts = []
+        cleared = Q(pk__in=[])
+        cleared_count = 0
+        for (teacher_id, day), present in cells.items():
+            if not self.first_day <= day <= self.last_day or current.get((teacher_id, day)) == present:
+                continue
+            if present is None:
+                cleared |= Q(teacher_id=teacher_id, date=day)
+                cleared_count += 1
+            else:
+                upserts.append(TeacherAttendance(teacher_id=teacher_id, date=day, present=present))
+        if upserts:
+            TeacherAttendance.objects.bulk_create(
+                upserts,
+                update_conflicts=True,
+                unique_fields=['teacher', 'date'],
+                update_fields=['present'],
+            )
+        if cleared_count:
+            self._attendance().filter(cleared).delete()
+        return {'saved': len(upserts), 'cleared': cleared_count}
+
+    def csv_rows(self, chunk_size=2000):
+        """Filas para el CSV de liquidación: encabezado y una fila por docente.
+
+        Recorre docentes y asistencias del mes en paralelo, ambos ordenados por
+        docente, con `iterator()`, así que la memoria no crece con la cantidad de docentes.
+        """
+        yield ['apellido', 'nombre', 'dni'] + [day.day for day in self.days] + ['presentes', 'ausentes']
+        marks = (
+            self._attendance()
+            .order_by('teacher__last_name', 'teacher__first_name', 'teacher_id', 'date')
+            .values_list('teacher_id', 'date', 'present')
+            .iterator(chunk_size=chunk_size)
+        )
+        pending = next(marks, None)
+        teachers = self.teachers().values_list('id', 'last_name', 'first_name', 'dni').iterator(chunk_size=chunk_size)
+        for teacher_id, last_name, first_name, dni in teachers:
+            by_day = {}
+            while pending is not None and pending[0] == teacher_id:
+                by_day[pending[1]] = pending[2]
+                pending = next(marks, None)
+            columns = []
+            for day in self.days:
+                present = by_day.get(day)
+                columns.append('' if present is None else ('P' if present else 'A'))
+            present_count = sum(1 for value in by_day.values() if value)
+            yield [last_name, first_name, dni] + columns + [present_count, len(by_day) - present_count]
+
+
+class TeacherWorkload:
+    """Carga horaria semanal de cada docente a partir de CourseMaterial y Subject.
+
+    Suma los módulos presenciales y de tutoría de todas las materias asignadas a
+    cada docente con una única consulta agrupada y guarda el resultado en el cache
+    de Django por CACHE_TIMEOUT segundos, con la versión 'teachers' de
+    `CacheVersion` en la clave. Guardar o borrar CourseMaterial, Subject o Teacher
+    incrementa esa versión (ver `TeachersConfig.ready`), así que con un cache
+    compartido todos los workers dejan de usar el resultado viejo.
+    """
+
+    cache_key = 'teachers:workload'
+
+    @staticmethod
+    def cap():
+        return getattr(settings, 'TEACHERS_WEEKLY_MODULES_CAP', 40)
+
+    @staticmethod
+    def _load():
+        Teacher = apps.get_model('teachers', 'Teacher')
+        rows = (
+            Teacher.objects.annotate(
+                materials=Count('course_materials'),
+                courses=Count('course_materials__course', distinct=True),
+                presential=Coalesce(Sum('course_materials__subject__weekly_hours_presential'), 0),
+                tutoring=Coalesce(Sum('course_materials__subject__weekly_hours_tutoring'), 0),
+            )
+            .annotate(total=F('presential') + F('tutoring'))
+            .order_by('-total', 'last_name', 'first_name')
+            .values('id', 'last_name', 'first_name', 'materials', 'courses', 'presential', 'tutoring', 'total')
+        )
+        return list(rows)
+
+    @classmethod
+    def rows(cls):
+        """Lista de dicts por docente (de mayor a menor carga) con `over_cap` según el tope actual."""
+        key = f"{cls.cache_key}:{CacheVersion.get('teachers')}"
+        rows = cache.get(key)
+        if rows is None:
+            rows = cls._load()
+            cache.set(key, rows, settings.CACHE_TIMEOUT)
+        cap = cls.cap()
+        return [dict(row, over_cap=row['total'] > cap) for row in rows]
+
+    @classmethod
+    def for_teacher(cls, teacher_id):
+        return next((row for row in cls.rows() if row['id'] == teacher_id), None)
+
+    @classmethod
+    def invalidate(cls):
+        CacheVersion.bump('teachers')
@@ -8,4 +8,7 @@ urlpatterns = [
     path('new/', views.TeacherCreateView.as_view(), name='create'),
     path('<int:pk>/edit/', views.TeacherUpdateView.as_view(), name='update'),
     path('<int:pk>/delete/', views.TeacherDeleteView.as_view(), name='delete'),
+    path('workload/', views.TeacherWorkloadView.as_view(), name='workload'),
+    path('attendance/', views.TeacherAttendanceGridView.as_view(), name='attendance'),
+    path('attendance/export/', views.TeacherAttendanceExportView.as_view(), name='attendance_export'),
 ]
@@ -1,11 +1,22 @@
+import csv
+from datetime import date
+
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.urls import reverse_lazy
-from django.views.generic import ListView, CreateView, UpdateView, DeleteView
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.urls import reverse, reverse_lazy
+from django.utils import timezone
+from django.views.generic import ListView, CreateView, UpdateView, DeleteView, TemplateView, View
+
+from core.streaming import streaming_response
+from core.views import PersonSearchListMixin
 
 from .models import Teacher
+from .services import TeacherAttendanceGrid, TeacherWorkload
 
 
-class TeacherListView(LoginRequiredMixin, PermissionRequiredMixin, ListView):
+class TeacherListView(LoginRequiredMixin, PermissionRequiredMixin, PersonSearchListMixin, ListView):
     """Lista de docentes."""
     model = Teacher
     template_name = 'teachers/teacher_list.html'
@@ -45,3 +56,99 @@ class TeacherDeleteView(LoginRequiredMixin, PermissionRequiredMixin, DeleteView)
     template_name = 'teachers/teacher_confirm_delete.html'
     permission_required = 'teachers.delete_teacher'
     success_url = reverse_lazy('teachers:list')
+
+
+class TeacherWorkloadView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
+    """Carga horaria semanal por docente (cacheada), marcando a quienes superan el tope."""
+    template_name = 'teachers/workload.html'
+    permission_required = 'teachers.view_teacher'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        rows = TeacherWorkload.rows()
+        context.update({
+            'rows': rows,
+            'cap': TeacherWorkload.cap(),
+            'over_cap_count': sum(1 for row in rows if row['over_cap']),
+        })
+        return context
+
+
+CELL_VALUES = {'P': True, 'A': False, '': None}
+
+
+def grid_from_request(request):
+    """Grilla del mes pedido en ?month=AAAA-MM (por defecto, el mes actual)."""
+    try:
+        year, month = (int(part) for part in request.GET.get('month', '').split('-'))
+        first = date(year, month, 1)
+    except ValueError:
+        first = timezone.localdate().replace(day=1)
+    return TeacherAttendanceGrid(first.year, first.month)
+
+
+class _Echo:
+    """Pseudo-buffer para csv.writer: devuelve la línea en vez de acumularla."""
+
+    def write(self, value):
+        return value
+
+
+class TeacherAttendanceGridView(LoginRequiredMixin, PermissionRequiredMixin, TemplateView):
+    """Grilla mensual de asistencia docente: se guardan solo las celdas cambiadas."""
+    template_name = 'teachers/attendance_grid.html'
+    permission_required = 'teachers.view_teacherattendance'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        grid = grid_from_request(self.request)
+        previous_month = (grid.year - 1, 12) if grid.month == 1 else (grid.year, grid.month - 1)
+        next_month = (grid.year + 1, 1) if grid.month == 12 else (grid.year, grid.month + 1)
+        context.update({
+            'grid': grid,
+            'rows': grid.rows(),
+            'month_value': f'{grid.year:04d}-{grid.month:02d}',
+            'previous_month': '%04d-%02d' % previous_month,
+            'next_month': '%04d-%02d' % next_month,
+        })
+        return context
+
+    def post(self, request, *args, **kwargs):
+        if not (request.user.has_perm('teachers.add_teacherattendance')
+                and request.user.has_perm('teachers.change_teacherattendance')):
+            raise PermissionDenied
+        grid = grid_from_request(request)
+        teacher_ids = set(Teacher.objects.values_list('id', flat=True))
+        cells = {}
+        for key, value in request.POST.items():
+            if not key.startswith('cell_') or value not in CELL_VALUES:
+                continue
+            try:
+                teacher_id, day = (int(part) for part in key[5:].split('_'))
+            except ValueError:
+                continue
+            if teacher_id in teacher_ids and 1 <= day <= len(grid.days):
+                cells[(teacher_id, grid.days[day - 1])] = CELL_VALUES[value]
+        result = grid.save(cells)
+        messages.success(
+            request,
+            f'Asistencia docente guardada: {result["saved"]} celdas actualizadas, {result["cleared"]} borradas.',
+        )
+        return redirect(f"{reverse('teachers:attendance')}?month={grid.year:04d}-{grid.month:02d}")
+
+
+class TeacherAttendanceExportView(LoginRequiredMixin, PermissionRequiredMixin, View):
+    """CSV de asistencia docente del mes para liquidación de haberes (streaming)."""
+    permission_required = 'teachers.view_teacherattendance'
+
+    def get(self, request, *args, **kwargs):
+        grid = grid_from_request(request)
+        writer = csv.writer(_Echo())
+        response = streaming_response(
+            request,
+            (writer.writerow(row) for row in grid.csv_rows()),
+            content_type='text/csv',
+        )
+        filename = f'asistencia_docente_{grid.year:04d}_{grid.month:02d}.csv'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response